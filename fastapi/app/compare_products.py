@@ -4,142 +4,347 @@
 여러 제품을 정규화하고 이미지를 수집하여 비교 가능한 형태로 반환하는 로직을 제공합니다.
 """
 
-import traceback
-from typing import Any
+import asyncio
+import logging
+import os
+import random
+from typing import Any, AsyncIterator
 
+import httpx
 from fastapi import HTTPException
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from .new_single_page_crawler import crawl_single_page
 from .normalize_product_name import (
-    convert_product_name_to_model,
-    product_name_to_model,
+    canonical_product_key,
+    convert_product_name_to_model_async,
+    save_product_mapping,
 )
 
+# 동시에 처리할 최대 제품 수 (환경변수로 조정 가능)
+COMPARE_CONCURRENCY = int(os.getenv("COMPARE_CONCURRENCY", "5"))
 
-async def compare_products_logic(product_names: list[str]) -> dict[str, Any]:
+# 일시적 오류 시 최대 크롤링 시도 횟수
+# (동시에 열리는 페이지 수는 크롤러의 CRAWL_PAGE_CONCURRENCY가 제한)
+CRAWL_MAX_ATTEMPTS = int(os.getenv("CRAWL_MAX_ATTEMPTS", "3"))
+
+# 재시도할 일시적 오류 (타임아웃, 네트워크 연결 오류)
+_TRANSIENT_ERRORS = (asyncio.TimeoutError, PlaywrightTimeoutError, httpx.TransportError)
+
+# 오류 메시지 템플릿 (실패할 때마다 긴 문자열을 새로 만들지 않도록 모듈 수준에 정의)
+# NORMALIZE_ERROR_TMPL은 단일 제품 정규화 실패 시 FastAPI(main)와 MCP 서버가 함께 사용
+NORMALIZE_ERROR_TMPL = (
+    "제품명 '{product_name}'에 대한 모델명을 찾을 수 없습니다.\n\n"
+    "가능한 원인:\n"
+    "1. 정확한 제품명 확인 필요\n"
+    "   • \"{product_name}\" 대신 다른 숫자나 명칭일 수 있습니다\n"
+    "   • 예: \"블루스카이 3100\" → \"블루스카이 3000\" 또는 \"블루스카이 3500\"\n"
+    "2. 제품명 변형 시도\n"
+    "   • 제조사명 포함 여부 확인 (예: \"삼성 전자 블루스카이 3100\")\n"
+    "   • 띄어쓰기 확인 (예: \"블루스카이3100\" vs \"블루스카이 3100\")\n"
+    "3. 다나와에서 직접 검색하여 정확한 제품명 확인"
+)
+_LOOKUP_ERROR_TMPL = (
+    "제품명 '{product_name}'에 대한 모델명을 찾을 수 없습니다.\n"
+    "가능한 원인: 제품명이 정확하지 않거나, 다른 숫자/명칭일 수 있습니다."
+)
+_ALL_FAILED_TMPL = (
+    "모든 제품 처리에 실패했습니다.\n\n"
+    "실패한 제품들:\n{all_errors}\n\n"
+    "해결 방법:\n"
+    "1. 각 제품명의 정확성을 확인하세요\n"
+    "2. 제조사명 포함 여부를 확인하세요 (예: \"삼성 전자 블루스카이 3100\")\n"
+    "3. 다나와에서 직접 검색하여 정확한 제품명을 확인하세요"
+)
+
+# 비교를 위한 가이드 (응답 메시지 끝에 추가)
+COMPARISON_GUIDE = (
+    "\n\n[비교 분석 가이드]\n"
+    "수집된 제품 이미지와 정보를 바탕으로 다음 항목을 중심으로 차이점을 비교 분석해주세요:\n"
+    "1. 제품 디자인: 색상, 형태, 크기 등의 차이\n"
+    "2. 제품 특징: 기능, 성능, 사양 등의 차이\n"
+    "3. 가격대: 다나와 링크를 통해 최신 가격 확인 가능\n"
+    "4. 주요 차이점: 각 제품의 고유한 특징과 장단점\n"
+    "\n[출력 형식]\n"
+    "- 이미지 태그나 URL을 출력하지 마세요. 이미지는 이미 제공되었으므로 직접 참조하여 분석하세요.\n"
+    "- 깔끔하고 읽기 쉬운 텍스트 형식으로만 출력하세요.\n"
+    "- 제품명, 모델명, 주요 특징, 차이점을 명확하게 정리하여 설명하세요.\n"
+    "- 공통점보다는 차이점에 집중하여 비교 설명해주세요."
+)
+
+COMPARISON_HINT = {
+    "focus": "차이점",
+    "comparison_points": [
+        "제품 디자인 (색상, 형태, 크기)",
+        "제품 특징 (기능, 성능, 사양)",
+        "가격대",
+        "주요 차이점 및 고유 특징"
+    ],
+    "note": "공통점보다는 차이점에 집중하여 비교해주세요.",
+    "output_format": "이미지 태그나 URL을 출력하지 말고, 깔끔한 텍스트 형식으로만 비교 분석 결과를 제공하세요."
+}
+
+
+def _is_transient_error(error: BaseException) -> bool:
+    """예외 또는 그 원인(크롤러가 감싼 원래 예외)이 일시적 오류인지 확인"""
+    while error is not None:
+        if isinstance(error, _TRANSIENT_ERRORS):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+async def _crawl_with_retry(
+    product_url: str,
+    client: httpx.AsyncClient | None = None,
+) -> list[dict[str, Any]]:
     """
-    여러 제품을 비교하기 위해 각 제품을 정규화하고 이미지를 수집하는 로직
+    일시적 오류는 지수 백오프(지터 포함)로 재시도하며 크롤링합니다.
+    
+    Args:
+        product_url: 크롤링할 제품 페이지 URL
+        client: 이미지 다운로드에 재사용할 HTTP 클라이언트 (선택)
+    
+    Returns:
+        crawl_single_page의 이미지 정보 리스트
+    """
+    for attempt in range(CRAWL_MAX_ATTEMPTS):
+        try:
+            return await crawl_single_page(product_url, client)
+        except Exception as e:
+            if attempt + 1 >= CRAWL_MAX_ATTEMPTS or not _is_transient_error(e):
+                raise
+            delay = 0.5 * 2 ** attempt + random.random()
+            logging.warning(
+                "[compare] 크롤링 재시도 (%d/%d) - %.1f초 후, URL: %s, 오류: %s",
+                attempt + 1, CRAWL_MAX_ATTEMPTS - 1, delay, product_url, e,
+            )
+            await asyncio.sleep(delay)
+
+
+async def _process_product(
+    product_name: str,
+    sem: asyncio.BoundedSemaphore,
+    client: httpx.AsyncClient | None = None,
+) -> dict[str, Any]:
+    """
+    단일 제품을 정규화하고 이미지를 수집합니다.
+    
+    Args:
+        product_name: 공백이 제거된 제품명
+        sem: 동시 크롤링 수를 제한하는 세마포어
+        client: 이미지 다운로드에 재사용할 HTTP 클라이언트 (선택)
+    
+    Returns:
+        dict: 제품의 정규화된 정보와 이미지 리스트
+    
+    Raises:
+        LookupError: 제품명에 대한 모델명을 찾지 못한 경우
+    """
+    # 1. 제품명 정규화 (블로킹 작업이므로 스레드에서 실행)
+    result = await convert_product_name_to_model_async(product_name)
+    if not result:
+        raise LookupError(_LOOKUP_ERROR_TMPL.format(product_name=product_name))
+    
+    model_name = result["model"]
+    product_url = result["url"]
+    
+    # 메모리에 저장
+    save_product_mapping(product_name, result)
+    
+    # 2. 이미지 크롤링
+    async with sem:
+        logging.info("[compare] 크롤링 시작 - 제품명: %s, URL: %s", product_name, product_url)
+        images_data = await _crawl_with_retry(product_url, client)
+    logging.info("[compare] 크롤링 완료 - 제품명: %s, 이미지 %d개 base64 인코딩 완료", product_name, len(images_data))
+    
+    return {
+        "product_name": product_name,
+        "model_name": model_name,
+        "url": product_url,
+        "image_count": len(images_data),
+        "images": images_data,
+    }
+
+
+def validate_product_names(product_names: list[str]) -> list[str]:
+    """
+    입력 제품명을 검증하고 중복을 제거합니다 (FastAPI/MCP 공용).
+    
+    Args:
+        product_names: 비교할 제품명 리스트 (최소 2개 이상)
+    
+    Returns:
+        공백이 제거되고 중복(대소문자/띄어쓰기/제조사 표기 무시)이 제거된 제품명 리스트 (처음 입력된 표기 유지)
+    
+    Raises:
+        ValueError: 제품명이 2개 미만인 경우
+    """
+    if not product_names or len(product_names) < 2:
+        raise ValueError("최소 2개 이상의 제품명을 입력해주세요.")
+    
+    unique_names: dict[str, str] = {}
+    for name in product_names:
+        name = name.strip()
+        if name:
+            unique_names.setdefault(canonical_product_key(name), name)
+    return list(unique_names.values())
+
+
+def prepare_product_names(product_names: list[str]) -> list[str]:
+    """
+    validate_product_names의 FastAPI용 래퍼 (검증 실패 시 400 응답).
+    
+    Raises:
+        HTTPException: 제품명이 2개 미만인 경우
+    """
+    try:
+        return validate_product_names(product_names)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _describe_failure(product_name: str, error: BaseException) -> str:
+    """제품 처리 실패를 로그로 남기고 사용자에게 보여줄 오류 메시지를 반환."""
+    if isinstance(error, LookupError):
+        return str(error)
+    
+    # 트레이스백 문자열은 로그 핸들러가 실제로 출력할 때만 만들어짐
+    logging.error("[compare] 제품 '%s' 처리 실패", product_name, exc_info=error)
+    return f"제품 '{product_name}' 처리 중 오류: {error}"
+
+
+def _build_result_message(success_count: int, errors: list[str]) -> str:
+    """수집 결과 요약 메시지와 비교 가이드를 생성."""
+    message = f"{success_count}개 제품의 정보를 수집했습니다."
+    if errors:
+        error_summary = "\n".join(errors[:3])  # 최대 3개만 표시
+        if len(errors) > 3:
+            error_summary += f"\n... 외 {len(errors) - 3}개 제품 처리 실패"
+        message += f"\n\n주의: {len(errors)}개 제품 처리 실패:\n{error_summary}"
+    return message + COMPARISON_GUIDE
+
+
+async def collect_products(
+    product_names: list[str],
+    client: httpx.AsyncClient | None = None,
+) -> dict[str, Any]:
+    """
+    여러 제품을 비교하기 위해 각 제품을 정규화하고 이미지를 수집하는 로직 (FastAPI/MCP 공용)
     
     두 개 이상의 제품명을 입력받아 각 제품을 정규화하고 이미지를 수집합니다.
     반환된 데이터를 통해 LLM이 공통점과 차이점을 분석할 수 있습니다.
     
     Args:
         product_names: 비교할 제품명 리스트 (최소 2개 이상)
+        client: 이미지 다운로드에 재사용할 HTTP 클라이언트 (선택)
     
     Returns:
         dict: 각 제품의 정규화된 정보와 이미지 리스트를 포함한 딕셔너리
         
     Raises:
-        HTTPException: 입력 검증 실패 또는 모든 제품 처리 실패 시
+        ValueError: 입력 검증 실패 시
+        LookupError: 모든 제품 처리 실패 시
     """
-    # 입력 검증
-    if not product_names or len(product_names) < 2:
-        raise HTTPException(
-            status_code=400,
-            detail="최소 2개 이상의 제품명을 입력해주세요."
-        )
+    names = validate_product_names(product_names)
+    
+    # 동시에 크롤링할 최대 제품 수 제한 (대상 사이트 부하 방지)
+    sem = asyncio.BoundedSemaphore(COMPARE_CONCURRENCY)
+    results = await asyncio.gather(
+        *[_process_product(name, sem, client) for name in names],
+        return_exceptions=True,
+    )
     
     products_info = []
     errors = []
-    
-    # 각 제품 처리
-    for product_name in product_names:
-        product_name = product_name.strip()
-        if not product_name:
-            continue
-            
-        try:
-            # 1. 제품명 정규화
-            result = convert_product_name_to_model(product_name)
-            if not result:
-                error_detail = (
-                    f"제품명 '{product_name}'에 대한 모델명을 찾을 수 없습니다.\n"
-                    "가능한 원인: 제품명이 정확하지 않거나, 다른 숫자/명칭일 수 있습니다."
-                )
-                errors.append(error_detail)
-                continue
-            
-            model_name = result["model"]
-            product_url = result["url"]
-            
-            # 메모리에 저장
-            product_name_to_model[product_name] = result
-            
-            # 2. 이미지 크롤링
-            print(f"[INFO] 크롤링 시작 - 제품명: {product_name}, URL: {product_url}")
-            images_data = await crawl_single_page(product_url)
-            print(f"[INFO] 크롤링 완료 - 제품명: {product_name}, 이미지 {len(images_data)}개 base64 인코딩 완료")
-            
-            products_info.append({
-                "product_name": product_name,
-                "model_name": model_name,
-                "url": product_url,
-                "image_count": len(images_data),
-                "images": images_data,
-            })
-        except Exception as e:
-            error_detail = str(e)
-            error_traceback = traceback.format_exc()
-            print(f"[ERROR] 제품 '{product_name}' 처리 실패")
-            print(f"[ERROR] 오류 내용: {error_detail}")
-            print(f"[ERROR] 전체 트레이스백:")
-            print(error_traceback)
-            errors.append(f"제품 '{product_name}' 처리 중 오류: {error_detail}")
+    for product_name, result in zip(names, results):
+        if isinstance(result, BaseException):
             # 오류가 발생해도 다른 제품 처리는 계속 진행
+            errors.append(_describe_failure(product_name, result))
+        else:
+            products_info.append(result)
     
     # 모든 제품 처리 실패 시
     if not products_info:
         all_errors = "\n".join(errors) if errors else "알 수 없는 오류"
-        raise HTTPException(
-            status_code=500,
-            detail=(
-                f"모든 제품 처리에 실패했습니다.\n\n"
-                f"실패한 제품들:\n{all_errors}\n\n"
-                "해결 방법:\n"
-                "1. 각 제품명의 정확성을 확인하세요\n"
-                "2. 제조사명 포함 여부를 확인하세요 (예: \"삼성 전자 블루스카이 3100\")\n"
-                "3. 다나와에서 직접 검색하여 정확한 제품명을 확인하세요"
-            )
-        )
-    
-    # 결과 메시지 생성
-    message = f"{len(products_info)}개 제품의 정보를 수집했습니다."
-    if errors:
-        error_summary = "\n".join(errors[:3])  # 최대 3개만 표시
-        if len(errors) > 3:
-            error_summary += f"\n... 외 {len(errors) - 3}개 제품 처리 실패"
-        message += f"\n\n주의: {len(errors)}개 제품 처리 실패:\n{error_summary}"
-    
-    # 비교를 위한 가이드 추가
-    comparison_guide = (
-        "\n\n[비교 분석 가이드]\n"
-        "수집된 제품 이미지와 정보를 바탕으로 다음 항목을 중심으로 차이점을 비교 분석해주세요:\n"
-        "1. 제품 디자인: 색상, 형태, 크기 등의 차이\n"
-        "2. 제품 특징: 기능, 성능, 사양 등의 차이\n"
-        "3. 가격대: 다나와 링크를 통해 최신 가격 확인 가능\n"
-        "4. 주요 차이점: 각 제품의 고유한 특징과 장단점\n"
-        "\n[출력 형식]\n"
-        "- 이미지 태그나 URL을 출력하지 마세요. 이미지는 이미 제공되었으므로 직접 참조하여 분석하세요.\n"
-        "- 깔끔하고 읽기 쉬운 텍스트 형식으로만 출력하세요.\n"
-        "- 제품명, 모델명, 주요 특징, 차이점을 명확하게 정리하여 설명하세요.\n"
-        "- 공통점보다는 차이점에 집중하여 비교 설명해주세요."
-    )
+        raise LookupError(_ALL_FAILED_TMPL.format(all_errors=all_errors))
     
     return {
         "products": products_info,
         "total_products": len(products_info),
         "success": True,
-        "message": message + comparison_guide,
-        "comparison_hint": {
-            "focus": "차이점",
-            "comparison_points": [
-                "제품 디자인 (색상, 형태, 크기)",
-                "제품 특징 (기능, 성능, 사양)",
-                "가격대",
-                "주요 차이점 및 고유 특징"
-            ],
-            "note": "공통점보다는 차이점에 집중하여 비교해주세요.",
-            "output_format": "이미지 태그나 URL을 출력하지 말고, 깔끔한 텍스트 형식으로만 비교 분석 결과를 제공하세요."
-        },
+        "message": _build_result_message(len(products_info), errors),
+        "comparison_hint": COMPARISON_HINT,
     }
 
+
+async def compare_products_logic(
+    product_names: list[str],
+    client: httpx.AsyncClient | None = None,
+) -> dict[str, Any]:
+    """
+    collect_products의 FastAPI용 래퍼 (입력 검증 실패는 400, 모든 제품 처리 실패는 500 응답)
+    
+    Raises:
+        HTTPException: 입력 검증 실패 또는 모든 제품 처리 실패 시
+    """
+    try:
+        return await collect_products(product_names, client)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def iter_compare_products(
+    product_names: list[str],
+    client: httpx.AsyncClient | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    제품 비교 결과를 처리가 끝나는 순서대로 하나씩 반환하는 비동기 제너레이터
+    
+    compare_products_logic과 같은 처리를 하지만 전체 결과를 한 번에 모으지 않으므로
+    클라이언트는 먼저 끝난 제품부터 받아볼 수 있고, 메모리에는 제품 하나 분량만 유지됩니다.
+    입력 검증은 호출 전에 prepare_product_names()로 수행해야 합니다.
+    
+    Args:
+        product_names: 검증 및 중복 제거가 끝난 제품명 리스트
+        client: 이미지 다운로드에 재사용할 HTTP 클라이언트 (선택)
+    
+    Yields:
+        dict: {"type": "product", "product": {...}} 또는 {"type": "error", "product_name": ..., "message": ...},
+              마지막으로 {"type": "summary", "total_products": ..., "success": ..., "message": ..., "comparison_hint": ...}
+    """
+    sem = asyncio.BoundedSemaphore(COMPARE_CONCURRENCY)
+    
+    async def run(name: str) -> tuple[str, dict[str, Any] | None, BaseException | None]:
+        try:
+            return name, await _process_product(name, sem, client), None
+        except Exception as e:
+            return name, None, e
+    
+    tasks = [asyncio.ensure_future(run(name)) for name in product_names]
+    success_count = 0
+    errors = []
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            product_name, product_info, error = await next_done
+            if error is not None:
+                message = _describe_failure(product_name, error)
+                errors.append(message)
+                yield {"type": "error", "product_name": product_name, "message": message}
+            else:
+                success_count += 1
+                yield {"type": "product", "product": product_info}
+    finally:
+        # 클라이언트 연결이 끊긴 경우 남은 작업 정리
+        for task in tasks:
+            task.cancel()
+    
+    yield {
+        "type": "summary",
+        "total_products": success_count,
+        "success": success_count > 0,
+        "message": _build_result_message(success_count, errors),
+        "comparison_hint": COMPARISON_HINT,
+    }
@@ -4,9 +4,11 @@
 이미지를 Base64로 인코딩하고 Claude 한도에 맞게 최적화하는 기능을 제공합니다.
 """
 
-import base64
+import hashlib
 import io
 import os
+import threading
+from collections import OrderedDict
 from typing import Tuple
 
 try:
@@ -16,6 +18,12 @@ except ImportError as exc:  # pragma: no cover
         "이미지 최적화를 위해 Pillow가 필요합니다. 'pip install Pillow' 실행 후 다시 시도하세요."
     ) from exc
 
+# SIMD(SSSE3/AVX2/NEON) 가속 base64 인코더 사용, 설치되지 않은 경우 표준 라이브러리로 대체
+try:
+    import pybase64 as base64  # type: ignore
+except ImportError:  # pragma: no cover
+    import base64
+
 
 RESAMPLE_FILTER = Image.Resampling.LANCZOS if hasattr(Image, "Resampling") else Image.LANCZOS
 
@@ -24,6 +32,31 @@ MAX_IMAGES_FOR_LLM = int(os.getenv("LLM_IMAGE_MAX_COUNT", "4"))
 MAX_LLM_IMAGE_BYTES = int(os.getenv("LLM_IMAGE_MAX_BYTES", str(950_000)))  # 약간의 버퍼
 MAX_LLM_IMAGE_DIMENSION = int(os.getenv("LLM_IMAGE_MAX_DIMENSION", "1024"))
 
+# 인코딩 결과 캐시의 최대 크기 (base64 문자열 기준 바이트 수, 0이면 캐시 사용 안 함)
+IMAGE_CACHE_MAX_BYTES = int(os.getenv("LLM_IMAGE_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+
+# JPEG 재압축 시 탐색할 품질 범위 (최대 품질은 환경변수로 조정 가능)
+JPEG_QUALITY_MIN = 50
+JPEG_QUALITY_MAX = max(JPEG_QUALITY_MIN, int(os.getenv("LLM_IMAGE_JPEG_QUALITY_MAX", "85")))
+JPEG_QUALITY_STEP = 5
+
+# 확장자 -> MIME 타입 매핑
+_MIME_MAP = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+    '.svg': 'image/svg+xml'
+}
+
+# 원본 이미지 내용 해시 기반 인코딩 결과 캐시
+# key: (BLAKE2b 다이제스트, MIME 타입, max_bytes, max_dimension)
+# value: (base64_string, optimized_mime_type, original_size, optimized_size)
+_encode_cache: "OrderedDict[tuple, Tuple[str, str, int, int]]" = OrderedDict()
+_encode_cache_bytes = 0
+_encode_cache_lock = threading.Lock()
+
 
 def get_mime_type_from_url(url: str, content_type: str | None = None) -> str:
     """
@@ -36,21 +69,41 @@ def get_mime_type_from_url(url: str, content_type: str | None = None) -> str:
     Returns:
         MIME 타입 문자열 (예: "image/jpeg", "image/png")
     """
-    # Content-Type 헤더가 있고 이미지인 경우 사용
-    if content_type and 'image' in content_type:
-        return content_type
+    # Content-Type 헤더가 있고 이미지인 경우 사용 (예: "image/png; charset=binary" -> "image/png")
+    if content_type:
+        mime_type = content_type.split(';', 1)[0].strip().lower()
+        if mime_type.startswith('image/'):
+            return mime_type
     
-    # 확장자로 판단
-    ext = os.path.splitext(url)[1].lower()
-    mime_map = {
-        '.jpg': 'image/jpeg',
-        '.jpeg': 'image/jpeg',
-        '.png': 'image/png',
-        '.gif': 'image/gif',
-        '.webp': 'image/webp',
-        '.svg': 'image/svg+xml'
-    }
-    return mime_map.get(ext, 'image/jpeg')
+    # 확장자로 판단 (쿼리 문자열 제외, 예: "/foo.jpg?v=1")
+    query_start = url.find('?')
+    path = url if query_start < 0 else url[:query_start]
+    dot = path.rfind('.')
+    ext = path[dot:].lower() if dot >= 0 else ''
+    return _MIME_MAP.get(ext, 'image/jpeg')
+
+
+def _encode_jpeg(img: "Image.Image", quality: int, buffer: io.BytesIO) -> bytes:
+    """
+    주어진 품질로 이미지를 JPEG 바이트로 인코딩합니다.
+    
+    같은 버퍼를 비워서 재사용하며, 4:2:0 크로마 서브샘플링과 progressive 인코딩으로
+    같은 품질에서 10~20% 더 작은 결과를 만듭니다.
+    LLM이 사용하지 않는 EXIF/ICC 메타데이터는 기록하지 않습니다.
+    """
+    buffer.seek(0)
+    buffer.truncate(0)
+    img.save(
+        buffer,
+        format="JPEG",
+        optimize=True,
+        quality=quality,
+        progressive=True,
+        subsampling=2,
+        exif=b"",
+        icc_profile=None,
+    )
+    return buffer.getvalue()
 
 
 def optimize_image_bytes(
@@ -79,6 +132,8 @@ def optimize_image_bytes(
         with Image.open(io.BytesIO(raw_bytes)) as img:
             if img.mode not in ("RGB", "L"):
                 img = img.convert("RGB")
+            img.info.pop("icc_profile", None)
+            img.info.pop("exif", None)
 
             longest_side = max(img.size)
             if longest_side > max_dimension:
@@ -86,20 +141,29 @@ def optimize_image_bytes(
                 new_size = (int(img.width * scale), int(img.height * scale))
                 img = img.resize(new_size, RESAMPLE_FILTER)
 
+            # 최고 품질로 먼저 한 번 인코딩하고 (리사이즈 후에는 대부분 여기서 끝남),
+            # 한도를 넘을 때만 나머지 품질 범위를 이진 탐색
             buffer = io.BytesIO()
-            quality = 85
-            optimized_size = original_size
-
-            while quality >= 50:
-                buffer.seek(0)
-                buffer.truncate(0)
-                img.save(buffer, format="JPEG", optimize=True, quality=quality)
-                optimized_size = buffer.tell()
-                if optimized_size <= max_bytes or quality == 50:
-                    break
-                quality -= 5
-
-            return buffer.getvalue(), "image/jpeg", original_size, optimized_size
+            best = _encode_jpeg(img, JPEG_QUALITY_MAX, buffer)
+            if len(best) > max_bytes:
+                smallest = best
+                best = None
+                lo, hi = JPEG_QUALITY_MIN, JPEG_QUALITY_MAX - JPEG_QUALITY_STEP
+                while lo <= hi:
+                    mid = lo + (hi - lo) // (2 * JPEG_QUALITY_STEP) * JPEG_QUALITY_STEP
+                    encoded = _encode_jpeg(img, mid, buffer)
+                    if len(encoded) <= max_bytes:
+                        best = encoded
+                        lo = mid + JPEG_QUALITY_STEP
+                    else:
+                        smallest = encoded
+                        hi = mid - JPEG_QUALITY_STEP
+                # 최저 품질로도 한도를 넘으면 가장 작은 결과를 그대로 사용
+                if best is None:
+                    best = smallest
+
+            optimized_size = len(best)
+            return best, "image/jpeg", original_size, optimized_size
     except Exception:
         # Pillow 처리 실패 시 원본 전달 (최소한 Claude 호출 전에 필터링 가능)
         return raw_bytes, mime_type, original_size, original_size
@@ -114,6 +178,7 @@ def encode_image_to_base64(
     """
     이미지 바이트를 Base64 문자열로 인코딩합니다.
     Claude 한도에 맞게 최적화도 함께 수행합니다.
+    같은 내용의 이미지는 캐시된 결과를 재사용하여 최적화와 인코딩을 생략합니다.
 
     Args:
         image_bytes: 이미지 바이트 데이터
@@ -124,6 +189,23 @@ def encode_image_to_base64(
     Returns:
         (base64_string, optimized_mime_type, original_size, optimized_size) 튜플
     """
+    # 이미 한도 안에 들어오는 이미지는 디코딩/해시 없이 바로 인코딩
+    image_size = len(image_bytes)
+    if image_size <= max_bytes:
+        return base64.b64encode(image_bytes).decode('ascii'), mime_type, image_size, image_size
+
+    cache_key = (
+        hashlib.blake2b(image_bytes, digest_size=16).digest(),
+        mime_type,
+        max_bytes,
+        max_dimension,
+    )
+    with _encode_cache_lock:
+        cached = _encode_cache.get(cache_key)
+        if cached is not None:
+            _encode_cache.move_to_end(cache_key)
+            return cached
+
     optimized_bytes, optimized_mime, original_size, optimized_size = optimize_image_bytes(
         image_bytes,
         mime_type,
@@ -131,7 +213,27 @@ def encode_image_to_base64(
         max_dimension,
     )
     
-    base64_string = base64.b64encode(optimized_bytes).decode('utf-8')
+    base64_string = base64.b64encode(optimized_bytes).decode('ascii')
     
-    return base64_string, optimized_mime, original_size, optimized_size
-
+    result = (base64_string, optimized_mime, original_size, optimized_size)
+    _store_encoded(cache_key, result)
+    return result
+
+
+def _store_encoded(cache_key: tuple, result: Tuple[str, str, int, int]) -> None:
+    """인코딩 결과를 캐시에 저장하고, 용량을 넘으면 오래된 항목부터 제거합니다."""
+    global _encode_cache_bytes
+
+    entry_size = len(result[0])
+    if entry_size > IMAGE_CACHE_MAX_BYTES:
+        return
+
+    with _encode_cache_lock:
+        previous = _encode_cache.pop(cache_key, None)
+        if previous is not None:
+            _encode_cache_bytes -= len(previous[0])
+        _encode_cache[cache_key] = result
+        _encode_cache_bytes += entry_size
+        while _encode_cache_bytes > IMAGE_CACHE_MAX_BYTES:
+            _, evicted = _encode_cache.popitem(last=False)
+            _encode_cache_bytes -= len(evicted[0])
@@ -1,17 +1,63 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+
+import orjson
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from . import schemas
-from .compare_products import compare_products_logic
-from .new_single_page_crawler import crawl_single_page
+from .compare_products import (
+    NORMALIZE_ERROR_TMPL,
+    prepare_product_names,
+    compare_products_logic,
+    iter_compare_products,
+)
+from .new_single_page_crawler import (
+    close_shared_browser,
+    create_http_client,
+    crawl_single_page,
+    warm_up_shared_browser,
+)
 from .normalize_product_name import (
-    convert_product_name_to_model,
+    DanawaSearchError,
+    convert_product_name_to_model_async,
+    find_saved_product_name,
+    load_saved_mappings,
     product_name_to_model,
+    save_product_mapping,
+)
+
+
+# /crawl에서 저장된 매핑을 찾지 못했을 때의 안내 메시지
+_CRAWL_NOT_FOUND_TMPL = (
+    "제품명 '{product_name}'에 대한 저장된 URL을 찾을 수 없습니다. "
+    "먼저 /normalize-product-name 엔드포인트를 사용하여 제품명을 등록해주세요."
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 수명 동안 이미지 다운로드용 HTTP 클라이언트(연결 풀)를 하나만 만들어 재사용하고, 공유 브라우저를 미리 실행/종료"""
+    # 저장된 제품 매핑은 요청 처리 중이 아니라 시작 시 스레드에서 디스크로부터 복원
+    await asyncio.to_thread(load_saved_mappings)
+    app.state.http = create_http_client()
+    await warm_up_shared_browser()
+    try:
+        yield
+    finally:
+        await app.state.http.aclose()
+        await close_shared_browser()
+
+
 app = FastAPI(
     title="FastAPI Application",
     version="1.0.0",
     description="FastAPI 기본 애플리케이션",
+    # base64 이미지가 포함된 큰 응답을 빠르게 직렬화하기 위해 orjson 사용
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 
@@ -29,12 +75,12 @@ def health_check() -> dict[str, str]:
 
 # 제품명을 모델명으로 변환하는 엔드포인트
 @app.post("/normalize-product-name", response_model=schemas.ProductNameToModelResponse)
-def normalize_product_name(request: schemas.ProductNameToModelRequest):
+async def normalize_product_name(request: schemas.ProductNameToModelRequest):
     """
     제품 이름을 모델명으로 정규화
     
     사용자가 제품 이름을 입력하면 모델명으로 변환하여 저장합니다.
-    변환된 매핑은 메모리에 저장되며, 나중에 크롤링할 때 사용됩니다.
+    변환된 매핑은 메모리(및 디스크 캐시)에 저장되며, 나중에 크롤링할 때 사용됩니다.
     
     Args:
         request: ProductNameToModelRequest (product_name: 제품 이름)
@@ -49,31 +95,27 @@ def normalize_product_name(request: schemas.ProductNameToModelRequest):
     
     # 제품명을 모델명과 URL로 변환하는 로직
     # 예: "삼성 블루스카이 5500" -> {"model": "AX060CG500G", "url": "http://..."}
-    result = convert_product_name_to_model(product_name)
+    try:
+        result = await convert_product_name_to_model_async(product_name)
+    except DanawaSearchError as e:
+        # 타임아웃/연결 오류는 "결과 없음"이 아니므로 잠시 후 재시도할 수 있도록 503으로 응답
+        logging.warning("[normalize] 다나와 검색 실패 - 제품명: %s (%s)", product_name, e.__cause__ or e)
+        raise HTTPException(
+            status_code=503,
+            detail=f"다나와 검색 중 일시적인 오류가 발생했습니다. 잠시 후 다시 시도해주세요: {e}"
+        )
     
     if not result:
-        # 더 상세한 오류 메시지 제공
-        error_detail = (
-            f"제품명 '{product_name}'에 대한 모델명을 찾을 수 없습니다.\n\n"
-            "가능한 원인:\n"
-            "1. 정확한 제품명 확인 필요\n"
-            f"   • \"{product_name}\" 대신 다른 숫자나 명칭일 수 있습니다\n"
-            "   • 예: \"블루스카이 3100\" → \"블루스카이 3000\" 또는 \"블루스카이 3500\"\n"
-            "2. 제품명 변형 시도\n"
-            "   • 제조사명 포함 여부 확인 (예: \"삼성 전자 블루스카이 3100\")\n"
-            "   • 띄어쓰기 확인\n"
-            "3. 다나와에서 직접 검색하여 정확한 제품명 확인"
-        )
         raise HTTPException(
             status_code=404,
-            detail=error_detail
+            detail=NORMALIZE_ERROR_TMPL.format(product_name=product_name)
         )
     
     model_name = result["model"]
     product_url = result["url"]
     
     # 메모리에 저장 (key: 제품명, value: {"model": 모델명, "url": URL})
-    product_name_to_model[product_name] = result
+    save_product_mapping(product_name, result)
     
     return {
         "product_name": product_name,
@@ -86,7 +128,7 @@ def normalize_product_name(request: schemas.ProductNameToModelRequest):
 
 # 크롤링 엔드포인트
 @app.post("/crawl", response_model=schemas.CrawlResponse)
-async def crawl_product_images(request: schemas.CrawlRequest):
+async def crawl_product_images(request: schemas.CrawlRequest, http_request: Request):
     """
     저장된 제품 URL을 사용하여 이미지를 크롤링하는 엔드포인트
     
@@ -103,58 +145,45 @@ async def crawl_product_images(request: schemas.CrawlRequest):
     
     product_name = request.product_name.strip()
     
-    # 저장된 매핑에서 URL 찾기
-    if product_name not in product_name_to_model:
-        # 대소문자 무시로 검색
-        found = False
-        for key, value in product_name_to_model.items():
-            if key.lower() == product_name.lower():
-                product_name = key  # 원본 키 사용
-                found = True
-                break
-        
-        if not found:
-            raise HTTPException(
-                status_code=404,
-                detail=f"제품명 '{product_name}'에 대한 저장된 URL을 찾을 수 없습니다. 먼저 /normalize-product-name 엔드포인트를 사용하여 제품명을 등록해주세요."
-            )
+    # 저장된 매핑에서 URL 찾기 (대소문자/띄어쓰기/제조사 표기 무시)
+    saved_name = find_saved_product_name(product_name)
+    if saved_name is None:
+        raise HTTPException(
+            status_code=404,
+            detail=_CRAWL_NOT_FOUND_TMPL.format(product_name=product_name)
+        )
+    product_name = saved_name  # 원본 키 사용
     
     product_info = product_name_to_model[product_name]
     product_url = product_info["url"]
     
     # 크롤링 실행
     try:
-        print(f"[INFO] 크롤링 시작 - 제품명: {product_name}, URL: {product_url}")
-        images_data = await crawl_single_page(product_url)
+        logging.info("[crawl] 크롤링 시작 - 제품명: %s, URL: %s", product_name, product_url)
+        images_data = await crawl_single_page(product_url, http_request.app.state.http)
         
-        print(f"[INFO] 크롤링 완료 - 이미지 {len(images_data)}개 base64 인코딩 완료")
+        logging.info("[crawl] 크롤링 완료 - 이미지 %d개 base64 인코딩 완료", len(images_data))
         
-        return {
+        # base64 이미지가 포함된 큰 응답이므로 response_model 검증을 건너뛰고 바로 직렬화
+        return ORJSONResponse({
             "product_name": product_name,
             "url": product_url,
             "image_count": len(images_data),
             "images": images_data,
             "success": True,
             "message": f"제품 '{product_name}'의 이미지 {len(images_data)}개를 성공적으로 크롤링하고 base64로 인코딩했습니다."
-        }
+        })
     except Exception as e:
-        import traceback
-        error_detail = str(e)
-        error_traceback = traceback.format_exc()
-        # 더 자세한 오류 정보를 로그에 출력
-        print(f"[ERROR] 크롤링 실패 - 제품명: {product_name}")
-        print(f"[ERROR] 오류 내용: {error_detail}")
-        print(f"[ERROR] 전체 트레이스백:")
-        print(error_traceback)
+        logging.exception("[crawl] 크롤링 실패 - 제품명: %s", product_name)
         raise HTTPException(
             status_code=500,
-            detail=f"크롤링 중 오류가 발생했습니다: {error_detail}"
+            detail=f"크롤링 중 오류가 발생했습니다: {e}"
         )
 
 
 # 제품 비교 엔드포인트
 @app.post("/compare-products", response_model=schemas.CompareProductsResponse)
-async def compare_products(request: schemas.CompareProductsRequest):
+async def compare_products(request: schemas.CompareProductsRequest, http_request: Request):
     """
     여러 제품을 비교하기 위해 각 제품을 정규화하고 이미지를 수집하는 엔드포인트
     
@@ -167,11 +196,53 @@ async def compare_products(request: schemas.CompareProductsRequest):
     Returns:
         CompareProductsResponse: 각 제품의 정규화된 정보와 이미지 리스트
     """
-    return await compare_products_logic(request.product_names)
+    result = await compare_products_logic(request.product_names, http_request.app.state.http)
+    # base64 이미지가 포함된 큰 응답이므로 response_model 검증을 건너뛰고 바로 직렬화
+    return ORJSONResponse(result)
+
+
+# 제품 비교 스트리밍 엔드포인트
+@app.post("/compare-products/stream")
+async def compare_products_stream(request: schemas.CompareProductsRequest, http_request: Request):
+    """
+    제품 비교 결과를 NDJSON(application/x-ndjson)으로 스트리밍하는 엔드포인트
+    
+    /compare-products와 같은 처리를 하지만, 각 제품의 처리가 끝나는 즉시 한 줄씩 전송합니다.
+    클라이언트는 나머지 제품의 크롤링이 끝나기 전에 먼저 도착한 결과를 사용할 수 있습니다.
+    
+    Args:
+        request: CompareProductsRequest (product_names: 제품명 리스트)
+    
+    Returns:
+        StreamingResponse: 제품별 결과 줄과 마지막 요약 줄로 구성된 NDJSON 스트림
+    """
+    names = prepare_product_names(request.product_names)
+    
+    async def ndjson_lines():
+        async for item in iter_compare_products(names, http_request.app.state.http):
+            yield orjson.dumps(item) + b"\n"
+    
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
 
 
 # 직접 실행 가능하도록 설정
 if __name__ == "__main__":
     import uvicorn
     
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # 로그는 직접 실행할 때만 설정 (mcp_server 등 이 모듈을 import하는 쪽의 로그 설정을 덮어쓰지 않도록)
+    # LOG_LEVEL=DEBUG이면 개별 이미지 실패의 트레이스백도 출력
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO").upper(),
+        format="[%(levelname)s] %(message)s",
+    )
+    
+    # uvicorn[standard]의 uvloop/httptools가 설치되어 있으면 사용하고, 없으면 asyncio/h11로 대체
+    # 제품 매핑은 시작 시 한 번만 디스크에서 복원되어 다른 워커가 나중에 저장한 매핑을 볼 수 없으므로 워커는 1개로 실행해야 함
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="auto",
+        access_log=os.getenv("UVICORN_ACCESS_LOG", "0") == "1",
+    )
@@ -10,7 +10,7 @@ single_page_image_crawler.py
 - 이미지 없으면 자동 스킵
 
 설치:
-    pip install playwright requests
+    pip install playwright "httpx[http2]"
     playwright install
 
 사용 방법:
@@ -20,14 +20,20 @@ single_page_image_crawler.py
 """
 
 import asyncio
+import logging
 import os
 import re
 import sys
-from pathlib import Path
-from urllib.parse import urljoin, urlparse
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+from urllib.parse import urljoin
 
-import requests
-from playwright.async_api import async_playwright
+import httpx
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError, async_playwright
 
 from .image_encoder import (
     encode_image_to_base64,
@@ -37,199 +43,395 @@ from .image_encoder import (
     MAX_LLM_IMAGE_DIMENSION,
 )
 
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Playwright
+
+# Playwright는 브라우저를 서브프로세스로 실행하므로 Windows에서는 ProactorEventLoop가 필요
+# (모듈 import 시 한 번만 설정하여 이후 생성되는 이벤트 루프에 적용)
+if sys.platform == "win32":
+    asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+
 
 DEFAULT_UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36"
 
+# 한 페이지에서 동시에 다운로드할 최대 이미지 수 (환경변수로 조정 가능)
+IMAGE_DOWNLOAD_CONCURRENCY = int(os.getenv("IMAGE_DOWNLOAD_CONCURRENCY", "8"))
+
+# 같은 상품 페이지를 다시 크롤링하지 않고 base64 결과를 재사용하는 시간 (초 단위, 0이면 캐시 사용 안 함)
+CRAWL_CACHE_TTL = int(os.getenv("CRAWL_CACHE_TTL_SECONDS", "600"))
+# 캐시할 최대 페이지 수 (페이지당 base64 이미지 최대 4장이므로 수 MB씩 차지)
+CRAWL_CACHE_SIZE = int(os.getenv("CRAWL_CACHE_SIZE", "16"))
+# key: 페이지 URL, value: (만료 시각, 읽기 전용 이미지 정보 튜플)
+# 같은 페이지의 재요청은 여기서 브라우저/다운로드/인코딩을 모두 건너뛰고,
+# image_encoder의 인코딩 캐시는 다른 페이지에 같은 이미지가 있을 때 다운로드 후 재인코딩만 건너뜀
+_crawl_cache: "OrderedDict[str, tuple[float, tuple[MappingProxyType, ...]]]" = OrderedDict()
+# Windows 대체 경로는 다른 스레드의 이벤트 루프에서 실행되므로 스레드 잠금으로 보호
+_crawl_cache_lock = threading.Lock()
+# 진행 중인 크롤링 (같은 URL을 동시에 요청하면 하나의 작업 결과를 함께 사용)
+_crawl_inflight: dict[str, asyncio.Task] = {}
+
+# 호출 간에 공유하는 Playwright/Chromium/컨텍스트 (생성된 이벤트 루프에서만 사용 가능, _get_shared_context 참고)
+_playwright: "Playwright | None" = None
+_browser: "Browser | None" = None
+_context: "BrowserContext | None" = None
+_browser_loop: asyncio.AbstractEventLoop | None = None
+_browser_lock: asyncio.Lock | None = None
+# 공유 브라우저에서 동시에 열 수 있는 최대 페이지 수 (모든 요청/도구 호출 합산, 환경변수로 조정 가능)
+CRAWL_PAGE_CONCURRENCY = int(os.getenv("CRAWL_PAGE_CONCURRENCY", "4"))
+_page_sem: asyncio.Semaphore | None = None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    이미지 다운로드용 HTTP 클라이언트를 생성합니다.
+    
+    HTTP/2와 keep-alive 연결 풀을 사용하므로, 여러 번의 크롤링에서 하나의 클라이언트를
+    재사용하면 TCP/TLS 핸드셰이크를 줄일 수 있습니다. 사용이 끝나면 aclose()로 닫아야 합니다.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=15,
+        follow_redirects=True,
+        headers={"User-Agent": DEFAULT_UA},
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    )
+
+
+# srcset 후보의 너비/배율 표기 (예: "800w", "2x")
+_SRCSET_WEIGHT_RE = re.compile(r"(\d+)[wx]")
+
 
 # 가상 브라우저의 해상도에 따른 view 차이를 고려해 가장 고화질 이미지를 불러오기 위한 함수
 def choose_from_srcset(srcset: str) -> str:
-    try:
-        cands = []
-        for part in srcset.split(","):
-            part = part.strip()
-            if " " in part:
-                u, sz = part.rsplit(" ", 1)
-                m = re.match(r"(\d+)(w|x)", sz)
-                weight = int(m.group(1)) if m else 0
-                cands.append((weight, u.strip()))
-            else:
-                cands.append((0, part))
-        cands.sort(key=lambda t: t[0], reverse=True)
-        return cands[0][1] if cands else ""
-    except Exception:
-        return ""
+    # 정렬 없이 한 번 순회하며 가장 큰 너비/배율의 후보를 선택 (같은 값이면 먼저 나온 후보)
+    best_weight, best_url = -1, ""
+    for part in srcset.split(","):
+        # 후보는 공백으로 구분된 "URL [크기]" 토큰 (빈 후보는 건너뜀)
+        tokens = part.split()
+        if not tokens:
+            continue
+        u = tokens[0]
+        m = _SRCSET_WEIGHT_RE.match(tokens[-1]) if len(tokens) > 1 else None
+        weight = int(m.group(1)) if m else 0
+        if weight > best_weight:
+            best_weight, best_url = weight, u
+    return best_url
+
+# 페이지 로딩 후 이미지 수집을 시작해도 되는지 판단하는 선택자
+IMAGE_READY_SELECTOR = "[id^='partContents_'] img"
+
+# 이미지 URL만 읽으면 되므로 페이지 로딩 시 내려받지 않을 리소스 유형
+# (문서/스크립트/XHR은 이미지 영역을 그리는 데 필요할 수 있으므로 통과)
+_BLOCKED_RESOURCE_TYPES = frozenset(
+    {"image", "media", "font", "stylesheet", "manifest", "texttrack", "eventsource", "ping"}
+)
+
+
+async def _block_heavy_resources(route) -> None:
+    """이미지/미디어/폰트/CSS/매니페스트/비콘 요청은 중단하고 나머지(HTML, JS 등)만 통과시킴"""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# 컨테이너 안의 모든 img 태그에서 src / data-src / srcset 속성을 한 번에 읽어오는 스크립트
+_COLLECT_IMAGE_ATTRS_JS = """
+([containerSel, imgSel]) => Array.from(document.querySelectorAll(containerSel)).flatMap(
+    (c) => Array.from(c.querySelectorAll(imgSel), (im) => [
+        im.getAttribute("src"),
+        im.getAttribute("data-src"),
+        im.getAttribute("srcset"),
+    ])
+)
+"""
+
 
 # 웹사이트에서 페이지 로딩 지연에 따라 저해상도 이미지를 먼저 로딩시킬때를 대비해 고해상도 이미지를 찾기 위한 함수
 async def collect_images(page, container_sel="[id^='partContents_']", img_sel="img"):
-    containers = await page.query_selector_all(container_sel)
+    # 이미지마다 get_attribute를 여러 번 호출하지 않고 page.evaluate 한 번으로 모든 속성을 가져옴
+    attrs = await page.evaluate(_COLLECT_IMAGE_ATTRS_JS, [container_sel, img_sel])
     img_urls = []
 
-    for c in containers:
-        imgs = await c.query_selector_all(img_sel)
-        for im in imgs:
-            src = await im.get_attribute("src")
-            if not src:
-                data_src = await im.get_attribute("data-src")
-                if data_src:
-                    src = data_src
-            if not src:
-                srcset = await im.get_attribute("srcset")
-                if srcset:
-                    src = choose_from_srcset(srcset)
-            if src:
-                img_urls.append(urljoin(page.url, src))
+    for src, data_src, srcset in attrs:
+        if not src:
+            src = data_src
+        if not src and srcset:
+            src = choose_from_srcset(srcset)
+        if src:
+            img_urls.append(urljoin(page.url, src))
     return img_urls
 
 
-# 내부 크롤링 함수 (별도 이벤트 루프에서 실행)
-async def _crawl_single_page_internal(url: str) -> list[dict[str, str]]:
+async def _download_and_encode(
+    client: httpx.AsyncClient,
+    sem: asyncio.Semaphore,
+    page_url: str,
+    idx: int,
+    img_url: str,
+) -> dict[str, str] | None:
     """
-    실제 크롤링 로직을 수행하는 내부 함수
-    이미지를 base64로 인코딩하여 반환
+    이미지 하나를 다운로드하여 base64로 인코딩합니다.
     
     Args:
-        url: 크롤링할 페이지 URL
+        client: 이미지 다운로드에 사용할 HTTP 클라이언트
+        sem: 동시 다운로드 수를 제한하는 세마포어
+        page_url: Referer로 보낼 상품 페이지 URL
+        idx: 이미지 순번 (1부터 시작)
+        img_url: 다운로드할 이미지 URL
     
     Returns:
-        이미지 정보 리스트: [{"url": "이미지URL", "base64": "base64데이터", "mime_type": "image/jpeg", "index": 1}, ...]
-    
-    Raises:
-        Exception: 크롤링 중 오류 발생 시
+        이미지 정보 딕셔너리, 실패 시 None
     """
-    browser = None
-    context = None
-    page = None
-    img_urls = []
-    images_data = []
-    
     try:
-        # Playwright를 context manager로 사용하여 자동 정리 보장
-        async with async_playwright() as p:
+        async with sem:
+            r = await client.get(img_url, headers={"Referer": page_url})
+        r.raise_for_status()
+        
+        # MIME 타입 결정
+        content_type = r.headers.get('Content-Type')
+        mime_type = get_mime_type_from_url(img_url, content_type)
+        
+        # 이미지 최적화 및 Base64 인코딩 (CPU 작업이므로 이벤트 루프를 막지 않도록 스레드에서 실행)
+        image_base64, optimized_mime, original_size, optimized_size = await asyncio.to_thread(
+            encode_image_to_base64,
+            r.content,
+            mime_type,
+            MAX_LLM_IMAGE_BYTES,
+            MAX_LLM_IMAGE_DIMENSION,
+        )
+        
+        logging.info(
+            "[crawl] encoded #%d %s (원본 %.1fKB -> %.1fKB)",
+            idx, optimized_mime, original_size / 1024, optimized_size / 1024,
+        )
+        return {
+            "url": img_url,
+            "base64": image_base64,
+            "mime_type": optimized_mime,
+            "index": idx,
+            "original_size_bytes": original_size,
+            "optimized_size_bytes": optimized_size,
+        }
+    except Exception as e:
+        # 트레이스백은 DEBUG 레벨에서만 출력
+        logging.warning(
+            "[crawl] image failed %s - %s", img_url, e,
+            exc_info=logging.getLogger().isEnabledFor(logging.DEBUG),
+        )
+        return None
+
+
+async def _create_crawl_context(browser: "Browser") -> "BrowserContext":
+    """크롤링용 컨텍스트를 만들고 무거운 리소스 차단 route를 등록"""
+    try:
+        context = await browser.new_context(user_agent=DEFAULT_UA)
+        # 이미지 바이트는 나중에 httpx로 받으므로 브라우저에서는 내려받지 않음
+        await context.route("**/*", _block_heavy_resources)
+    except Exception as e:
+        raise Exception(f"브라우저 컨텍스트 생성 실패: {str(e)}")
+    return context
+
+
+async def _get_shared_context() -> "BrowserContext":
+    """
+    현재 이벤트 루프에서 공유하는 Chromium 컨텍스트를 반환합니다
+    (최초 호출 시 또는 브라우저 연결이 끊긴 경우에만 브라우저/컨텍스트를 새로 생성).
+    
+    Playwright 비동기 객체는 생성된 이벤트 루프에 묶여 있으므로, 다른 루프에서 호출되면 새로 실행합니다.
+    크롤링마다 컨텍스트(쿠키/스토리지/네트워크 스택)를 초기화하지 않고 페이지만 새로 엽니다.
+    """
+    global _playwright, _browser, _context, _browser_loop, _browser_lock, _page_sem
+    loop = asyncio.get_running_loop()
+    if _browser_loop is not loop:
+        _playwright = None
+        _browser = None
+        _context = None
+        _browser_loop = loop
+        _browser_lock = asyncio.Lock()
+        _page_sem = asyncio.Semaphore(CRAWL_PAGE_CONCURRENCY)
+    async with _browser_lock:
+        if _browser is None or not _browser.is_connected():
+            _context = None
             try:
-                browser = await p.chromium.launch(headless=True)
+                if _playwright is None:
+                    _playwright = await async_playwright().start()
+                _browser = await _playwright.chromium.launch(headless=True)
             except Exception as e:
                 raise Exception(f"브라우저 실행 실패: {str(e)}")
-            
-            try:
-                context = await browser.new_context(user_agent=DEFAULT_UA)
-                page = await context.new_page()
-            except Exception as e:
-                raise Exception(f"브라우저 컨텍스트 생성 실패: {str(e)}")
+        if _context is None:
+            _context = await _create_crawl_context(_browser)
+    return _context
 
-            try:
-                print(f"[open] {url}")
-                # networkidle이 너무 엄격할 수 있으므로 domcontentloaded로 먼저 시도
-                try:
-                    await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-                    # 페이지가 완전히 로드될 때까지 추가 대기
-                    await page.wait_for_timeout(2000)
-                except Exception:
-                    # domcontentloaded 실패 시 load로 시도
-                    await page.goto(url, wait_until="load", timeout=30000)
-                    await page.wait_for_timeout(2000)
-            except Exception as e:
-                raise Exception(f"페이지 로딩 실패 (URL: {url}): {str(e)}")
 
+def _needs_separate_loop() -> bool:
+    """
+    Windows의 SelectorEventLoop(예: uvicorn --reload)는 Playwright 서브프로세스를 띄울 수 없으므로
+    별도 스레드의 새 ProactorEventLoop에서 실행해야 하는지 여부
+    """
+    return sys.platform == "win32" and not isinstance(asyncio.get_running_loop(), asyncio.ProactorEventLoop)
+
+
+async def warm_up_shared_browser() -> None:
+    """서버 시작 시 공유 브라우저/컨텍스트를 미리 생성하여 첫 크롤링 요청의 실행 지연을 없앰 (실패해도 계속 진행)"""
+    if _needs_separate_loop():
+        return
+    try:
+        await _get_shared_context()
+        logging.info("[crawl] shared browser ready")
+    except Exception as exc:
+        logging.warning("[crawl] browser warm-up failed: %s", exc)
+
+
+async def close_shared_browser() -> None:
+    """공유 브라우저와 Playwright를 종료합니다 (앱 종료 시 호출)."""
+    global _playwright, _browser, _context, _browser_loop
+    browser, playwright = _browser, _playwright
+    _playwright = None
+    _browser = None
+    _context = None
+    _browser_loop = None
+    if browser is not None:
+        try:
+            await browser.close()
+        except Exception as exc:
+            logging.warning("[crawl] browser close failed: %s", exc)
+    if playwright is not None:
+        try:
+            await playwright.stop()
+        except Exception as exc:
+            logging.warning("[crawl] playwright stop failed: %s", exc)
+
+
+async def _collect_page_image_urls(url: str, context: "BrowserContext") -> list[str]:
+    """
+    새 페이지에서 상품 페이지를 열어 다운로드할 이미지 URL을 수집하고 페이지를 닫습니다.
+    
+    Returns:
+        중복이 제거되고 MAX_IMAGES_FOR_LLM개로 제한된 이미지 URL 리스트
+    """
+    page = None
+    img_urls: list[str] = []
+    
+    try:
+        try:
+            page = await context.new_page()
+        except Exception as e:
+            raise Exception(f"브라우저 페이지 생성 실패: {str(e)}")
+
+        try:
+            logging.info("[crawl] open %s", url)
+            # networkidle이 너무 엄격할 수 있으므로 domcontentloaded로 먼저 시도
             try:
-                img_urls = await collect_images(page)
-                print(f"[found] {len(img_urls)} images (before limiting)")
-                if len(img_urls) > MAX_IMAGES_FOR_LLM:
-                    img_urls = img_urls[:MAX_IMAGES_FOR_LLM]
-                    print(f"[trimmed] Claude 한도에 맞춰 {len(img_urls)}장만 사용")
-            except Exception as e:
-                raise Exception(f"이미지 수집 실패: {str(e)}")
-
-            # 이미지가 없는 경우에도 정상적으로 처리
-            if len(img_urls) == 0:
-                print(f"[warning] 이미지를 찾을 수 없습니다. 선택자 '[id^=\"partContents_\"]' 내에 이미지가 없을 수 있습니다.")
-                return []
-
-            # 이미지를 다운로드하고 base64로 인코딩
-            for idx, img_url in enumerate(img_urls, start=1):
-                try:
-                    headers = {"User-Agent": DEFAULT_UA, "Referer": url}
-                    r = requests.get(img_url, headers=headers, timeout=15)
-                    r.raise_for_status()
-                    
-                    # MIME 타입 결정
-                    content_type = r.headers.get('Content-Type')
-                    mime_type = get_mime_type_from_url(img_url, content_type)
-                    
-                    # 이미지 최적화 및 Base64 인코딩
-                    image_base64, optimized_mime, original_size, optimized_size = encode_image_to_base64(
-                        r.content,
-                        mime_type,
-                        MAX_LLM_IMAGE_BYTES,
-                        MAX_LLM_IMAGE_DIMENSION,
-                    )
-                    
-                    images_data.append({
-                        "url": img_url,
-                        "base64": image_base64,
-                        "mime_type": optimized_mime,
-                        "index": idx,
-                        "original_size_bytes": original_size,
-                        "optimized_size_bytes": optimized_size,
-                    })
-                    
-                    print(
-                        f"  [encoded] #{idx} {optimized_mime} "
-                        f"(원본 {original_size/1024:.1f}KB -> {optimized_size/1024:.1f}KB)"
-                    )
-                except Exception as e:
-                    print(f"  [ERROR] {img_url} - {e}")
-                    # 개별 이미지 다운로드 실패는 계속 진행
-
-            # 브라우저 정리 (context manager가 자동으로 정리하지만 명시적으로도 정리)
-            if page:
-                try:
-                    await page.close()
-                except Exception:
-                    pass
-            if context:
-                try:
-                    await context.close()
-                except Exception:
-                    pass
-            if browser:
-                try:
-                    await browser.close()
-                except Exception:
-                    pass
-
-        print(f"[done] {len(images_data)} images encoded to base64")
-        return images_data
-        
-    except Exception as e:
-        # 추가 정리 작업
-        if page:
-            try:
-                await page.close()
+                await page.goto(url, wait_until="domcontentloaded", timeout=30000)
             except Exception:
+                # domcontentloaded 실패 시 load로 시도
+                await page.goto(url, wait_until="load", timeout=30000)
+            # 고정 시간 대기 대신 상품 이미지가 DOM에 나타나는 즉시 진행
+            try:
+                await page.wait_for_selector(IMAGE_READY_SELECTOR, state="attached", timeout=8000)
+            except PlaywrightTimeoutError:
+                # 이미지가 없는 페이지일 수 있으므로 그대로 진행
                 pass
-        if context:
+        except Exception as e:
+            raise Exception(f"페이지 로딩 실패 (URL: {url}): {str(e)}")
+
+        try:
+            # 같은 이미지가 여러 img 태그로 반복되는 경우가 있으므로 순서를 유지하며 중복 제거
+            # (한도 적용 전에 제거해야 서로 다른 이미지로 한도를 채울 수 있음)
+            img_urls = list(dict.fromkeys(await collect_images(page)))
+            logging.info("[crawl] found %d images (before limiting)", len(img_urls))
+            if len(img_urls) > MAX_IMAGES_FOR_LLM:
+                img_urls = img_urls[:MAX_IMAGES_FOR_LLM]
+                logging.info("[crawl] Claude 한도에 맞춰 %d장만 사용", len(img_urls))
+        except Exception as e:
+            raise Exception(f"이미지 수집 실패: {str(e)}")
+    finally:
+        # 이미지 URL만 있으면 되므로 다운로드 전에 페이지를 닫아 브라우저 자원을 먼저 반환
+        if page:
             try:
-                await context.close()
+                await page.close()
             except Exception:
                 pass
-        if browser:
+    return img_urls
+
+
+# 내부 크롤링 함수
+async def _crawl_single_page_internal(
+    url: str,
+    client: httpx.AsyncClient,
+    context: "BrowserContext",
+    page_sem: asyncio.Semaphore | None = None,
+) -> list[dict[str, str]]:
+    """
+    실제 크롤링 로직을 수행하는 내부 함수
+    이미지를 base64로 인코딩하여 반환
+    
+    브라우저/컨텍스트는 호출자가 관리하며, 이 함수는 호출마다 페이지만 새로 열고 닫습니다.
+    
+    Args:
+        url: 크롤링할 페이지 URL
+        client: 이미지 다운로드에 사용할 HTTP 클라이언트
+        context: 페이지를 열 브라우저 컨텍스트 (_create_crawl_context로 생성)
+        page_sem: 페이지를 여는 동안 점유할 세마포어 (이미지 다운로드 중에는 반환)
+    
+    Returns:
+        이미지 정보 리스트: [{"url": "이미지URL", "base64": "base64데이터", "mime_type": "image/jpeg", "index": 1}, ...]
+    
+    Raises:
+        Exception: 크롤링 중 오류 발생 시
+    """
+    async with page_sem if page_sem is not None else nullcontext():
+        img_urls = await _collect_page_image_urls(url, context)
+
+    # 이미지가 없는 경우에도 정상적으로 처리
+    if len(img_urls) == 0:
+        logging.warning("[crawl] 이미지를 찾을 수 없습니다. 선택자 '[id^=\"partContents_\"]' 내에 이미지가 없을 수 있습니다.")
+        return []
+
+    # 이미지를 동시에 다운로드하고 base64로 인코딩 (결과는 원래 순서 유지)
+    sem = asyncio.Semaphore(IMAGE_DOWNLOAD_CONCURRENCY)
+    results = await asyncio.gather(
+        *[_download_and_encode(client, sem, url, idx, img_url) for idx, img_url in enumerate(img_urls, start=1)]
+    )
+    # 개별 이미지 다운로드 실패(None)는 제외하고 계속 진행
+    images_data = [item for item in results if item is not None]
+
+    logging.info("[crawl] %d images encoded to base64", len(images_data))
+    return images_data
+
+
+async def _crawl_with_own_browser(url: str) -> list[dict[str, str]]:
+    """이번 호출에서만 쓰는 브라우저와 HTTP 클라이언트로 크롤링 (별도 이벤트 루프에서 실행할 때 사용)"""
+    async with async_playwright() as p:
+        try:
+            browser = await p.chromium.launch(headless=True)
+        except Exception as e:
+            raise Exception(f"브라우저 실행 실패: {str(e)}")
+        try:
+            context = await _create_crawl_context(browser)
+            async with create_http_client() as client:
+                return await _crawl_single_page_internal(url, client, context)
+        finally:
             try:
                 await browser.close()
             except Exception:
                 pass
-        # 예외를 다시 발생시켜서 상위에서 처리하도록
-        raise
 
 
 #실질적인 크롤링 함수 (Windows 이벤트 루프 문제 해결)
-async def crawl_single_page(url: str) -> list[dict[str, str]]:
+async def crawl_single_page(url: str, client: httpx.AsyncClient | None = None) -> list[dict[str, str]]:
     """
     단일 페이지에서 이미지를 크롤링하는 함수
-    Windows에서 이벤트 루프 문제를 해결하기 위해 별도 스레드에서 실행
     이미지를 base64로 인코딩하여 반환
     
+    Chromium과 컨텍스트는 이벤트 루프마다 한 번만 생성하여 호출 간에 공유하고, 호출마다 페이지만 새로 엽니다.
+    같은 URL을 CRAWL_CACHE_TTL 안에 다시 요청하면 크롤링/다운로드/인코딩 없이 이전 결과를 반환하고,
+    같은 URL을 동시에 요청하면 한 번만 크롤링하여 결과를 나눠 씁니다 (반환값은 호출마다 새 복사본).
+    
     Args:
         url: 크롤링할 페이지 URL
+        client: 재사용할 HTTP 클라이언트 (생략 시 이번 호출에서만 쓰는 클라이언트를 생성)
     
     Returns:
         이미지 정보 리스트: [{"url": "이미지URL", "base64": "base64데이터", "mime_type": "image/jpeg", "index": 1}, ...]
@@ -237,42 +439,75 @@ async def crawl_single_page(url: str) -> list[dict[str, str]]:
     Raises:
         Exception: 크롤링 중 오류 발생 시
     """
-    # Windows에서 이벤트 루프 문제 해결: 별도 스레드에서 새 이벤트 루프 생성
-    if sys.platform == "win32":
-        import concurrent.futures
-        
-        def run_in_new_loop():
-            """새 이벤트 루프에서 크롤링 실행"""
-            # Windows에서는 ProactorEventLoop를 명시적으로 사용
-            if sys.version_info >= (3, 8):
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-            else:
-                loop = asyncio.new_event_loop()
-            
-            try:
-                return loop.run_until_complete(_crawl_single_page_internal(url))
-            except Exception as e:
-                # 예외를 다시 발생시켜서 상위로 전파
-                raise
-            finally:
-                try:
-                    # 남은 작업 완료
-                    pending = asyncio.all_tasks(loop)
-                    if pending:
-                        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-                except Exception:
-                    pass
-                finally:
-                    loop.close()
-        
-        # 별도 스레드에서 실행
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(run_in_new_loop)
-            return future.result()  # 결과 반환 (예외도 전파됨)
-    else:
-        # Windows가 아닌 경우 현재 이벤트 루프에서 실행
-        return await _crawl_single_page_internal(url)
+    cached = _get_cached_crawl(url)
+    if cached is not None:
+        logging.info("[crawl] cache hit %s (%d images)", url, len(cached))
+        return cached
+    
+    # 같은 이벤트 루프에서 이미 진행 중인 크롤링이 있으면 그 결과를 함께 기다림
+    loop = asyncio.get_running_loop()
+    task = _crawl_inflight.get(url)
+    if task is None or task.get_loop() is not loop:
+        task = loop.create_task(_crawl_and_cache(url, client))
+        _crawl_inflight[url] = task
+        task.add_done_callback(lambda done: _forget_inflight_crawl(url, done))
+    # 먼저 요청한 호출자가 취소되어도 함께 기다리는 호출자를 위해 작업은 계속 진행
+    images = await asyncio.shield(task)
+    return [dict(image) for image in images]
+
+
+async def _crawl_and_cache(url: str, client: httpx.AsyncClient | None) -> tuple[MappingProxyType, ...]:
+    """크롤링 후 결과를 읽기 전용으로 만들어 캐시에 저장."""
+    images_data = await _crawl_uncached(url, client)
+    images = tuple(MappingProxyType(image) for image in images_data)
+    _put_cached_crawl(url, images)
+    return images
+
+
+def _forget_inflight_crawl(url: str, task: asyncio.Task) -> None:
+    """완료된 크롤링 작업을 진행 중 목록에서 제거 (기다리는 호출자가 없어도 예외가 경고로 남지 않도록 조회)."""
+    if _crawl_inflight.get(url) is task:
+        del _crawl_inflight[url]
+    if not task.cancelled():
+        task.exception()
+
+
+def _get_cached_crawl(url: str) -> list[dict[str, str]] | None:
+    """만료되지 않은 크롤링 결과를 캐시에서 조회하고 최근 사용 항목으로 갱신 (호출자가 수정해도 되는 복사본 반환)."""
+    with _crawl_cache_lock:
+        entry = _crawl_cache.get(url)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _crawl_cache[url]
+            return None
+        _crawl_cache.move_to_end(url)
+    return [dict(image) for image in entry[1]]
+
+
+def _put_cached_crawl(url: str, images: tuple[MappingProxyType, ...]) -> None:
+    """크롤링 결과를 캐시에 저장 (이미지를 찾지 못한 결과는 일시적인 실패일 수 있으므로 저장하지 않음)."""
+    if CRAWL_CACHE_TTL <= 0 or not images:
+        return
+    with _crawl_cache_lock:
+        _crawl_cache[url] = (time.monotonic() + CRAWL_CACHE_TTL, images)
+        _crawl_cache.move_to_end(url)
+        while len(_crawl_cache) > CRAWL_CACHE_SIZE:
+            _crawl_cache.popitem(last=False)
+
+
+async def _crawl_uncached(url: str, client: httpx.AsyncClient | None) -> list[dict[str, str]]:
+    """캐시 없이 크롤링을 수행 (공유 브라우저 또는 Windows 대체 경로 선택)."""
+    # Windows SelectorEventLoop에서는 별도 스레드의 새 ProactorEventLoop에서 실행 (이벤트 루프는 막지 않음)
+    if _needs_separate_loop():
+        # 공유 브라우저/클라이언트는 다른 이벤트 루프에 묶여 있으므로 새 루프에서는 별도로 생성
+        return await asyncio.to_thread(asyncio.run, _crawl_with_own_browser(url))
+    
+    context = await _get_shared_context()
+    if client is not None:
+        return await _crawl_single_page_internal(url, client, context, _page_sem)
+    async with create_http_client() as own_client:
+        return await _crawl_single_page_internal(url, own_client, context, _page_sem)
 
 
 if __name__ == "__main__":
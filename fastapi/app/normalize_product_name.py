@@ -1,97 +1,385 @@
+import asyncio
+import atexit
 import logging
+import os
+import queue
 import re
-from urllib.parse import urljoin
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Mapping
+from urllib.parse import quote, urljoin
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from playwright.sync_api import TimeoutError as PlaywrightTimeoutError, sync_playwright
 
-# 제품명 -> 모델명 및 URL 매핑 저장용 변수 (메모리에 저장)
+# 상세 페이지 HTTP 캐시 (ETag/Last-Modified 재검증), 설치되지 않은 경우 일반 세션 사용
+try:
+    import requests_cache  # type: ignore
+except ImportError:  # pragma: no cover
+    requests_cache = None
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Browser, BrowserContext
+
+# C 기반 lxml 파서가 설치되어 있으면 사용 (html.parser보다 수 배 빠름), 없으면 표준 라이브러리 파서로 대체
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = "lxml"
+except ImportError:  # pragma: no cover
+    _HTML_PARSER = "html.parser"
+
+# 제목/요약 문구에서 모델명을 찾는 패턴
+# (AP70F03102RTD처럼 숫자/문자가 섞인 더 구체적인 패턴의 일치 결과는 모두 이 패턴에도 일치하므로 하나로 충분)
+_MODEL_RE = re.compile(r"\b[A-Z]{2,}[0-9A-Z]{4,}\b")
+# 페이지 전체 텍스트에서 모델명을 찾는 패턴 (우선순위 순)
+_PAGE_MODEL_PATTERNS = (
+    re.compile(r"\bAP\d{2}[A-Z]\d{5}[A-Z]{2,}\b"),  # AP70F03102RTD 같은 패턴
+    re.compile(r"\b[A-Z]{2,}\d{2,}[A-Z]{1,}\d{2,}[A-Z]{2,}\b"),  # 일반적인 긴 모델명
+    re.compile(r"\b[A-Z]{2,}[0-9A-Z]{6,}\b"),  # 6자 이상 모델명
+)
+_PCODE_RE = re.compile(r'pcode=(\d+)')
+
+# 필요한 하위 트리만 파싱하도록 class 기준으로 요소를 거름 (나머지 헤더/광고/스크립트 등은 트리를 만들지 않음)
+_SEARCH_STRAINER = SoupStrainer(attrs={"class": re.compile(r"\bproduct_list\b")})
+_DETAIL_STRAINER = SoupStrainer(
+    attrs={"class": re.compile(r"\b(?:spec_tbl|prod_spec|prod_tit|prod_summary_info|product_info)\b")}
+)
+
+# canonical_product_key에서 통일할 제조사 표기 (casefold된 접두어, 긴 것부터 검사)
+_BRAND_PREFIXES = (
+    ("삼성 전자", "삼성"),
+    ("삼성전자", "삼성"),
+    ("삼성", "삼성"),
+    ("lg 전자", "lg"),
+    ("lg전자", "lg"),
+    ("엘지 전자", "lg"),
+    ("엘지전자", "lg"),
+    ("엘지", "lg"),
+    ("lg", "lg"),
+)
+
+# 다나와 요청에 사용하는 User-Agent와 헤더 (requests/Playwright 공통)
+_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+_REQUEST_HEADERS = {"User-Agent": _USER_AGENT, "Referer": "https://search.danawa.com/"}
+# (연결, 읽기) 타임아웃: 연결이 안 되는 경우는 빨리 포기하고 Playwright 대체 경로로 넘어감
+_REQUEST_TIMEOUT = (3, 7)
+
+# 스펙 표에서 모델명 행을 찾기 위한 항목명 키워드
+_MODEL_LABEL_KEYWORDS = ("모델명", "제품모델명", "model", "model name")
+
+# 상세 페이지에서 모델명 추출에 필요한 텍스트를 한 번에 반환: [스펙 행 목록, 제목, 요약 정보]
+# 스펙 행은 첫 번째 th/td 텍스트의 [항목명, 값] 쌍 (둘 중 하나라도 없는 행은 제외), 없는 요소는 빈 문자열
+_DETAIL_TEXTS_JS = """
+() => {
+    const text = (selector) => {
+        const element = document.querySelector(selector);
+        return element ? element.innerText : "";
+    };
+    const rows = Array.from(document.querySelectorAll("table.spec_tbl tr, .spec_tbl tr, .prod_spec tr"))
+        .map((row) => [row.querySelector("th"), row.querySelector("td")])
+        .filter(([th, td]) => th && td)
+        .map(([th, td]) => [th.innerText.trim(), td.innerText.trim()]);
+    return [
+        rows,
+        text("h3.prod_tit, h1.prod_tit, .prod_tit"),
+        text(".prod_summary_info, .product_info, .spec_summary"),
+    ];
+}
+"""
+
+# 검색 결과에서 첫 번째 상품의 [일치한 선택자, 상품 링크 href]를 반환 (상품이 없으면 null, 링크가 없으면 href는 null)
+_FIRST_PRODUCT_LINK_JS = """
+() => {
+    for (const selector of [".product_list .prod_item", ".prod_item", ".product_item"]) {
+        const item = document.querySelector(selector);
+        if (item) {
+            const link = item.querySelector(".prod_name a, a[class^='click_log_product_standard_title_']");
+            return [selector, link ? link.getAttribute("href") : null];
+        }
+    }
+    return null;
+}
+"""
+
+# 마지막 대체 경로에서 모델명 패턴을 검색할 요소 (body 전체 텍스트를 CDP로 전송하지 않도록 범위 제한)
+_MODEL_TEXT_SELECTORS = "h1, h2, h3, .spec_tbl, .prod_spec, .prod_summary_info, .product_info, .spec_summary"
+_JOIN_INNER_TEXT_JS = "(elements) => elements.map((element) => element.innerText).join('\\n')"
+
+# 검색/상세 페이지는 텍스트만 파싱하므로 Playwright에서 내려받지 않을 리소스 유형
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+
+# 제품명 -> 모델명 및 URL 매핑 저장용 변수 (메모리에 저장, 디스크 캐시가 켜져 있으면 처음 조회/저장할 때 복원)
 # 구조: {"제품명": {"model": "모델명", "url": "URL"}}
-product_name_to_model: dict[str, dict[str, str]] = {}
+product_name_to_model: dict[str, Mapping[str, str]] = {}
+
+# 대소문자/띄어쓰기/제조사 표기 무시 조회용 인덱스 (key: canonical_product_key, value: product_name_to_model의 원본 키)
+# product_name_to_model에 쓸 때는 항상 save_product_mapping()을 사용해 함께 갱신합니다.
+_product_name_ci_index: dict[str, str] = {}
+
+# 다나와 검색 결과 LRU 캐시 (key: canonical_product_key, value: 읽기 전용 {"model", "url"})
+# 검색에 실패한 제품명은 메모리에 캐시하지 않고, 아래 디스크 캐시에만 TTL과 함께 기록합니다.
+RESOLVER_CACHE_SIZE = int(os.getenv("NORMALIZE_CACHE_SIZE", "4096"))
+_resolver_cache: "OrderedDict[str, Mapping[str, str]]" = OrderedDict()
+_resolver_cache_lock = threading.Lock()
+
+# 검색 키워드별 LRU 캐시 (key: casefold된 키워드, value: 읽기 전용 {"model", "url"})
+# 서로 다른 제품명에서 같은 변형 키워드가 만들어지는 경우 다나와 검색을 한 번만 수행합니다.
+KEYWORD_CACHE_SIZE = int(os.getenv("NORMALIZE_KEYWORD_CACHE_SIZE", "2048"))
+_keyword_cache: "OrderedDict[str, Mapping[str, str]]" = OrderedDict()
+_keyword_cache_lock = threading.Lock()
+
+# 디스크 캐시 파일을 두는 디렉터리 (기본값: $XDG_CACHE_HOME/sw_mcp 또는 ~/.cache/sw_mcp, 처음 사용할 때 생성)
+NORMALIZE_CACHE_DIR = os.getenv(
+    "NORMALIZE_CACHE_DIR",
+    os.path.join(os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "sw_mcp"),
+)
+# 서버 재시작 후에도 검색 결과를 재사용하기 위한 SQLite 디스크 캐시 (빈 값이면 사용 안 함)
+NORMALIZE_CACHE_DB = os.getenv("NORMALIZE_CACHE_DB", os.path.join(NORMALIZE_CACHE_DIR, "normalize_cache.sqlite3"))
+# 디스크에 저장된 검색 결과/제품 매핑을 재사용하는 기간 (초 단위, 0이면 만료 없음)
+MAPPING_TTL = int(os.getenv("NORMALIZE_MAPPING_TTL_SECONDS", str(30 * 24 * 3600)))
+# 제품명 변형 키워드를 동시에 검색할 때 사용하는 스레드 수
+KEYWORD_SEARCH_WORKERS = int(os.getenv("NORMALIZE_KEYWORD_WORKERS", "4"))
+_keyword_executor = ThreadPoolExecutor(max_workers=KEYWORD_SEARCH_WORKERS, thread_name_prefix="danawa-search")
+
+# 검색 실패 결과를 다시 시도하지 않고 유지하는 시간 (초)
+NEGATIVE_CACHE_TTL = int(os.getenv("NORMALIZE_NEGATIVE_TTL_SECONDS", "3600"))
+_disk_cache: sqlite3.Connection | None = None
+_disk_cache_lock = threading.Lock()
+# 제품 매핑 쓰기는 요청 경로(이벤트 루프)를 막지 않도록 전용 스레드 하나에서 순서대로 처리
+_disk_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="normalize-cache-writer")
+# 저장된 제품 매핑은 import 시점이 아니라 서버 시작 시 load_saved_mappings()로 한 번만 복원
+_mappings_loaded = False
+_mappings_load_lock = threading.Lock()
+
+
+# 상세 페이지(prod.danawa.com) 응답을 저장하는 HTTP 캐시 파일과 재검증 주기 (초 단위, 0이면 사용 안 함)
+HTTP_CACHE_DB = os.getenv("NORMALIZE_HTTP_CACHE_DB", os.path.join(NORMALIZE_CACHE_DIR, "normalize_http_cache.sqlite3"))
+HTTP_CACHE_EXPIRE = int(os.getenv("NORMALIZE_HTTP_CACHE_SECONDS", str(7 * 24 * 3600)))
+
+
+def _ensure_parent_dir(path: str) -> None:
+    """캐시 파일이 위치할 디렉터리가 없으면 생성."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+
+def _create_session() -> requests.Session:
+    """
+    search.danawa.com / prod.danawa.com 요청에 keep-alive 연결을 재사용하는 세션 생성
 
+    requests-cache가 설치되어 있으면 상세 페이지 응답을 SQLite에 저장하고,
+    만료 후 요청은 If-None-Match/If-Modified-Since로 재검증하여 304 응답 시 저장된 본문을 사용합니다.
+    검색 결과 페이지는 순위가 바뀔 수 있으므로 캐시하지 않습니다
+    (응답의 Cache-Control 헤더가 이 설정을 덮어쓰지 않도록 cache_control은 사용하지 않음).
+    """
+    session = None
+    if requests_cache is not None and HTTP_CACHE_EXPIRE > 0 and HTTP_CACHE_DB:
+        try:
+            _ensure_parent_dir(HTTP_CACHE_DB)
+            session = requests_cache.CachedSession(
+                HTTP_CACHE_DB,
+                backend="sqlite",
+                expire_after=requests_cache.DO_NOT_CACHE,
+                urls_expire_after={"prod.danawa.com": HTTP_CACHE_EXPIRE},
+            )
+        except Exception as exc:
+            logging.warning("[normalize] http cache disabled (%s): %s", HTTP_CACHE_DB, exc)
+    if session is None:
+        session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504)),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(_REQUEST_HEADERS)
+    return session
+
+
+# 모듈 전체에서 공유하는 HTTP 세션 (요청마다 TCP/TLS 핸드셰이크를 반복하지 않도록, 첫 요청 시 생성)
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """공유 HTTP 세션을 (최초 사용 시) 생성하여 반환."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _create_session()
+    return _session
+
+# Chromium 브라우저를 유지하는 전용 스레드와 작업 큐 (None은 종료 신호)
+_browser_jobs: "queue.Queue[tuple[Callable[..., Any], tuple, Future] | None]" = queue.Queue()
+_browser_thread: threading.Thread | None = None
+_browser_thread_lock = threading.Lock()
+# 브라우저 전용 스레드에서만 사용하는 재사용 컨텍스트 (key: User-Agent)
+_browser_contexts: dict[str, "BrowserContext"] = {}
+
+
+def _browser_worker() -> None:
+    """전용 스레드에서 브라우저를 유지하며 작업 큐의 검색 작업을 차례로 실행."""
+    playwright = None
+    browser = None
+    try:
+        while True:
+            job = _browser_jobs.get()
+            if job is None:
+                break
+            func, args, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                # 최초 호출 시 또는 브라우저가 종료된 경우에만 새로 실행
+                if browser is None or not browser.is_connected():
+                    if playwright is None:
+                        playwright = sync_playwright().start()
+                    browser = playwright.chromium.launch(headless=True)
+                    _browser_contexts.clear()
+                future.set_result(func(browser, *args))
+            except BaseException as exc:
+                future.set_exception(exc)
+    finally:
+        _browser_contexts.clear()
+        if browser is not None:
+            try:
+                browser.close()
+            except Exception as exc:
+                logging.warning("[normalize] browser close failed: %s", exc)
+        if playwright is not None:
+            try:
+                playwright.stop()
+            except Exception as exc:
+                logging.warning("[normalize] playwright stop failed: %s", exc)
 
-def normalize_search_keyword(product_name: str) -> list[str]:
+
+def _shutdown_browser() -> None:
+    """프로세스 종료 시 브라우저 전용 스레드를 멈추고 브라우저를 닫음."""
+    _browser_jobs.put(None)
+    if _browser_thread is not None:
+        _browser_thread.join(timeout=10)
+
+
+def _run_with_browser(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    공유 브라우저를 첫 번째 인자로 하여 func를 브라우저 전용 스레드에서 실행하고 결과를 반환합니다.
+    
+    Playwright 동기 API 객체는 생성한 스레드에서만 사용할 수 있으므로, Chromium은 전용 스레드 하나에서
+    프로세스 수명 동안 한 번만 실행하고 컨텍스트도 재사용합니다 (검색마다 페이지만 새로 엶).
+    """
+    global _browser_thread
+    with _browser_thread_lock:
+        if _browser_thread is None:
+            _browser_thread = threading.Thread(target=_browser_worker, name="playwright-browser", daemon=True)
+            _browser_thread.start()
+            atexit.register(_shutdown_browser)
+    future: Future = Future()
+    _browser_jobs.put((func, args, future))
+    return future.result()
+
+
+def normalize_search_keyword(product_name: str) -> Iterator[str]:
     """
     검색 키워드를 정규화하여 여러 변형을 생성하는 함수
     
+    제너레이터이므로 앞선 키워드로 검색에 성공하면 나머지 변형은 만들지 않습니다.
+    
     Args:
         product_name: 원본 제품 이름
     
-    Returns:
-        검색을 시도할 키워드 리스트 (우선순위 순)
+    Yields:
+        검색을 시도할 키워드 (우선순위 순, 중복 제외)
     """
-    import re
-    
-    keywords = [product_name]  # 원본을 먼저 시도
+    seen = set()
+    for keyword in _iter_keyword_variants(product_name):
+        if keyword not in seen:
+            seen.add(keyword)
+            yield keyword
+
+
+def _iter_keyword_variants(product_name: str) -> Iterator[str]:
+    """원본 제품명과 제조사명 표기 변형을 우선순위 순으로 생성 (중복 포함)"""
+    yield product_name  # 원본을 먼저 시도
     
     # 삼성 관련 정규화
     # "삼성"으로 시작하고 "전자"가 없는 경우
-    if re.match(r'^삼성\s*', product_name) and "전자" not in product_name:
-        # "삼성" 뒤의 내용 추출
-        match = re.match(r'^삼성\s*(.+)', product_name)
-        if match:
-            rest = match.group(1)
+    if product_name.startswith("삼성") and "전자" not in product_name:
+        # "삼성" 뒤의 내용 추출 (단순 접두어이므로 정규식 대신 문자열 슬라이싱)
+        rest = product_name[2:].lstrip()
+        if rest:
             # 여러 변형 추가
             normalized_name1 = f"삼성 전자 {rest}".strip()
             normalized_name2 = f"삼성전자 {rest}".strip()
             if normalized_name1 != product_name:
-                keywords.append(normalized_name1)
+                yield normalized_name1
             if normalized_name2 != product_name and normalized_name2 != normalized_name1:
-                keywords.append(normalized_name2)
+                yield normalized_name2
     # "삼성전자"가 붙어있는 경우 "삼성 전자"로 변경
     elif "삼성전자" in product_name and "삼성 전자" not in product_name:
         normalized_name = product_name.replace("삼성전자", "삼성 전자")
         if normalized_name != product_name:
-            keywords.append(normalized_name)
+            yield normalized_name
     # "삼성 전자"가 있는 경우 "삼성전자"로도 시도
     elif "삼성 전자" in product_name:
         normalized_name = product_name.replace("삼성 전자", "삼성전자")
         if normalized_name != product_name:
-            keywords.append(normalized_name)
+            yield normalized_name
     
     # LG 관련 정규화
-    if re.match(r'^(LG|lg|엘지)\s*', product_name, re.IGNORECASE) and "전자" not in product_name:
-        match = re.match(r'^(LG|lg|엘지)\s*(.+)', product_name, re.IGNORECASE)
-        if match:
-            rest = match.group(2)
+    # "LG"(대소문자 무시) 또는 "엘지"로 시작하고 "전자"가 없는 경우
+    if "전자" not in product_name and (product_name[:2].lower() == "lg" or product_name.startswith("엘지")):
+        rest = product_name[2:].lstrip()
+        if rest:
             normalized_name = f"LG전자 {rest}".strip()
             if normalized_name != product_name:
-                keywords.append(normalized_name)
-    
-    # 중복 제거 및 원본 순서 유지
-    seen = set()
-    result = []
-    for keyword in keywords:
-        if keyword not in seen:
-            seen.add(keyword)
-            result.append(keyword)
+                yield normalized_name
+
+
+def canonical_product_key(product_name: str) -> str:
+    """
+    같은 제품을 가리키는 제품명 표기를 하나의 캐시/매핑 키로 정규화합니다.
     
-    return result
+    연속 공백을 하나로 줄이고 대소문자를 무시하며, 제조사 표기를 통일합니다.
+    예: "삼성 블루스카이", "삼성전자 블루스카이", "삼성 전자  블루스카이" -> "삼성 블루스카이"
+    """
+    key = " ".join(product_name.split()).casefold()
+    for prefix, brand in _BRAND_PREFIXES:
+        if key.startswith(prefix):
+            rest = key[len(prefix):].lstrip()
+            return f"{brand} {rest}" if rest else brand
+    return key
 
 
 def _extract_model_from_detail_html(html: str) -> str | None:
     """스펙 테이블/요약 문구에서 모델명을 추출."""
-    soup = BeautifulSoup(html, "html.parser")
-
-    # 테이블 기반 추출
-    for selector in [
-        "table.spec_tbl tr",
-        ".spec_tbl tr",
-        ".prod_spec tr",
-    ]:
-        for row in soup.select(selector):
-            header = row.find("th")
-            value = row.find("td")
-            if not header or not value:
-                continue
-            label = header.get_text(strip=True).lower()
-            if any(keyword in label for keyword in ["모델명", "제품모델명", "model", "model name"]):
-                text = value.get_text(strip=True)
-                if text:
-                    return text
+    soup = BeautifulSoup(html, _HTML_PARSER, parse_only=_DETAIL_STRAINER)
+
+    # 테이블 기반 추출 (세 선택자를 한 번의 select로 처리, 같은 행은 한 번만 검사)
+    for row in soup.select("table.spec_tbl tr, .spec_tbl tr, .prod_spec tr"):
+        header = row.find("th")
+        value = row.find("td")
+        if not header or not value:
+            continue
+        label = header.get_text(strip=True).lower()
+        if any(keyword in label for keyword in _MODEL_LABEL_KEYWORDS):
+            text = value.get_text(strip=True)
+            if text:
+                return text
 
     # 제목/요약에서 패턴 검색
+    # 우선순위 순서대로 이어 붙여 정규식 검색을 한 번만 수행 (가장 앞선 후보의 첫 일치 결과와 동일)
     candidates = []
     for selector in [
         "h3.prod_tit",
@@ -104,300 +392,539 @@ def _extract_model_from_detail_html(html: str) -> str | None:
         if element:
             candidates.append(element.get_text(" ", strip=True))
 
-    pattern = r"\b[A-Z]{2,}[0-9A-Z]{4,}\b"
-    for text in candidates:
-        match = re.search(pattern, text or "")
-        if match:
-            return match.group(0)
+    match = _MODEL_RE.search(" ".join(candidates))
+    if match:
+        return match.group(0)
 
     return None
 
 
-def _search_with_requests(search_url: str, user_agent: str) -> dict[str, str] | None:
-    """Playwright 실패 시 requests/BeautifulSoup 기반 크롤링."""
-    headers = {"User-Agent": user_agent, "Referer": "https://search.danawa.com/"}
-    resp = requests.get(search_url, headers=headers, timeout=10)
+def _search_with_requests(search_url: str) -> dict[str, str] | None:
+    """requests/BeautifulSoup 기반 크롤링 (다나와는 검색/상세 페이지를 서버에서 렌더링하므로 기본 경로로 사용)."""
+    resp = _get_session().get(search_url, timeout=_REQUEST_TIMEOUT)
     resp.raise_for_status()
 
-    soup = BeautifulSoup(resp.text, "html.parser")
+    soup = BeautifulSoup(resp.text, _HTML_PARSER, parse_only=_SEARCH_STRAINER)
     product = soup.select_one(".product_list .prod_item")
     if not product:
-        logging.warning("[normalize-fallback] product list empty")
+        logging.warning("[normalize-requests] product list empty")
         return None
 
     link = product.select_one(".prod_name a, a[class^='click_log_product_standard_title_']")
     if not link or not link.get("href"):
-        logging.warning("[normalize-fallback] product link missing")
+        logging.warning("[normalize-requests] product link missing")
         return None
 
     product_url = link.get("href")
     if product_url.startswith("/info"):
         product_url = urljoin("http://prod.danawa.com", product_url)
 
-    detail_resp = requests.get(product_url, headers=headers, timeout=10)
+    detail_resp = _get_session().get(product_url, timeout=_REQUEST_TIMEOUT)
     detail_resp.raise_for_status()
     model_name = _extract_model_from_detail_html(detail_resp.text)
 
     if model_name:
         logging.info(
-            "[normalize-fallback] extracted model=%s url=%s",
+            "[normalize-requests] extracted model=%s url=%s",
             model_name,
             product_url,
         )
         return {"model": model_name, "url": product_url}
 
-    logging.warning("[normalize-fallback] unable to find model text")
+    logging.warning("[normalize-requests] unable to find model text")
     return None
 
 
-def search_danawa_and_extract_model(search_keyword: str) -> dict[str, str] | None:
+def _block_heavy_resources(route) -> None:
+    """이미지/미디어/폰트/CSS 요청은 중단하고 나머지(HTML, JS 등)만 통과시킴"""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _get_browser_context(browser: "Browser", user_agent: str) -> "BrowserContext":
+    """
+    User-Agent별로 한 번만 만든 컨텍스트를 반환합니다. 브라우저 전용 스레드에서만 호출됩니다.
+    
+    컨텍스트 생성과 리소스 차단 route 등록을 검색마다 반복하지 않으며,
+    다나와 쿠키/캐시가 유지되어 이후 검색의 페이지 로딩도 빨라집니다.
+    """
+    context = _browser_contexts.get(user_agent)
+    if context is None:
+        context = browser.new_context(user_agent=user_agent)
+        context.route("**/*", _block_heavy_resources)
+        _browser_contexts[user_agent] = context
+    return context
+
+
+def _search_with_playwright(
+    browser: "Browser",
+    search_url: str,
+    search_keyword: str,
+    user_agent: str,
+) -> dict[str, str] | None:
+    """
+    공유 브라우저의 재사용 컨텍스트에서 새 페이지를 열어 다나와 검색 및 상세 페이지를 파싱합니다.
+    브라우저 전용 스레드에서만 호출됩니다 (_run_with_browser 참고).
+    """
+    playwright_result: dict[str, str] | None = None
+    page = _get_browser_context(browser, user_agent).new_page()
+    try:
+        logging.info("[normalize] search_url=%s keyword=%s", search_url, search_keyword)
+
+        # HTML 파싱이 끝난 뒤(domcontentloaded) 진행해야 상품 항목과 그 안의 링크가 모두 DOM에 있음
+        # (이미지/폰트 등은 차단되어 있으므로 load 이벤트까지 기다리지 않음)
+        page.goto(search_url, timeout=20000, wait_until="domcontentloaded")
+
+        # 검색 결과 확인
+        products_found = False
+        try:
+            page.wait_for_selector(".product_list .prod_item", timeout=10000)
+            products_found = True
+        except PlaywrightTimeoutError:
+            # 검색 결과가 없거나 로딩이 느린 경우
+            logging.warning("[normalize] product list selector timeout, trying alternative selectors")
+            # 대체 선택자 시도
+            try:
+                page.wait_for_selector(".prod_item, .product_item", timeout=5000)
+                products_found = True
+            except PlaywrightTimeoutError:
+                logging.warning("[normalize] no products found with any selector")
+                products_found = False
+
+        if not products_found:
+            logging.warning("[normalize] skipping product extraction - no products found")
+        else:
+            # 선택자마다 locator.count()를 호출하지 않도록 첫 상품과 링크를 page.evaluate 한 번으로 찾음
+            first_product = page.evaluate(_FIRST_PRODUCT_LINK_JS)
+            if first_product is None:
+                logging.warning("[normalize] no product items found with any selector")
+            else:
+                selector, product_url = first_product
+                logging.info("[normalize] found products with selector: %s", selector)
+                if not product_url:
+                    logging.warning("[normalize] product link not found")
+                else:
+                    if product_url.startswith("/info"):
+                        product_url = "http://prod.danawa.com" + product_url
+
+                    page.goto(product_url, timeout=20000, wait_until="domcontentloaded")
+                    # 고정 시간 대기 대신 스펙 표가 나타나는 즉시 진행
+                    # (페이지 상단의 제품명 등 먼저 나타나는 요소는 기다리지 않음: 스펙 표가 아직 없을 수 있음)
+                    try:
+                        page.wait_for_selector(
+                            "table.spec_tbl, .spec_tbl, .prod_spec",
+                            state="attached",
+                            timeout=8000,
+                        )
+                    except PlaywrightTimeoutError:
+                        logging.warning("[normalize] detail page selector timeout, parsing what is loaded")
+
+                    model_name = None
+                    # 행/요소마다 locator를 다시 찾지 않도록 스펙 표, 제목, 요약 정보를 page.evaluate 한 번으로 읽음
+                    spec_rows, title_text, info_text = page.evaluate(_DETAIL_TEXTS_JS)
+                    for label, value in spec_rows:
+                        if any(keyword in label.lower() for keyword in _MODEL_LABEL_KEYWORDS):
+                            model_name = value
+                            break
+
+                    if not model_name and title_text:
+                        # 제목에서 모델명 추출 시도
+                        logging.info("[normalize] title text: %.100s", title_text)
+                        match = _MODEL_RE.search(title_text)
+                        if match:
+                            model_name = match.group(0)
+                            logging.info("[normalize] found model in title: %s", model_name)
+
+                    if not model_name and info_text:
+                        # 상세 정보에서 모델명 추출 시도
+                        logging.info("[normalize] info text: %.100s", info_text)
+                        match = _MODEL_RE.search(info_text)
+                        if match:
+                            model_name = match.group(0)
+                            logging.info("[normalize] found model in info: %s", model_name)
+
+                    # URL에서 pcode 추출 (모델명이 없어도 URL은 유효)
+                    current_url = page.url
+                    pcode_match = _PCODE_RE.search(current_url)
+                    if pcode_match:
+                        logging.info("[normalize] found pcode in URL: %s", pcode_match.group(1))
+
+                    # 모델명이 없어도 URL이 있으면 반환 (나중에 모델명 추출 가능)
+                    # 하지만 우선 모델명을 찾기 위해 페이지 전체 텍스트에서도 시도
+                    if not model_name:
+                        try:
+                            # 제목/스펙/요약 영역 텍스트에서 모델명 패턴 검색
+                            page_text = page.eval_on_selector_all(_MODEL_TEXT_SELECTORS, _JOIN_INNER_TEXT_JS)
+                            for pattern in _PAGE_MODEL_PATTERNS:
+                                matches = pattern.findall(page_text)
+                                if matches:
+                                    # 가장 긴 모델명을 선택 (일반적으로 더 정확함)
+                                    model_name = max(matches, key=len)
+                                    logging.info("[normalize] found model in page text with pattern %s: %s", pattern.pattern, model_name)
+                                    break
+                        except Exception as e:
+                            logging.warning("[normalize] failed to extract model from page text: %s", e)
+
+                    if model_name:
+                        logging.info("[normalize] extracted model=%s url=%s", model_name, product_url)
+                        playwright_result = {"model": model_name, "url": product_url}
+                    elif product_url:
+                        # 모델명을 찾지 못했지만 URL은 있으면, URL 기반으로 임시 모델명 생성
+                        # pcode를 모델명으로 사용하거나, URL의 일부를 사용
+                        if pcode_match:
+                            temp_model = f"PCODE_{pcode_match.group(1)}"
+                            logging.warning("[normalize] model name not found, using pcode as model: %s", temp_model)
+                            playwright_result = {"model": temp_model, "url": product_url}
+                        else:
+                            logging.warning("[normalize] model name not found in detail page and no pcode")
+                    else:
+                        logging.warning("[normalize] model name not found in detail page")
+    finally:
+        try:
+            page.close()
+        except Exception as exc:
+            logging.warning("[normalize] page close failed: %s", exc)
+    return playwright_result
+
+
+def search_danawa_and_extract_model(search_keyword: str) -> Mapping[str, str] | None:
     """
     다나와에서 검색하여 모델명과 URL을 추출하는 함수
     
+    같은 키워드(대소문자 무시)로 이미 성공한 검색 결과는 키워드 LRU 캐시에서 바로 반환합니다.
+    
     Args:
         search_keyword: 검색 키워드
     
     Returns:
         {"model": "모델명", "url": "URL"} 또는 None
     """
-    import urllib.parse
+    keyword_key = search_keyword.strip().casefold()
+    with _keyword_cache_lock:
+        cached = _keyword_cache.get(keyword_key)
+        if cached is not None:
+            _keyword_cache.move_to_end(keyword_key)
+            return cached
+
+    result = _search_danawa_uncached(search_keyword)
+    if not result:
+        return None
 
-    encoded_keyword = urllib.parse.quote(search_keyword)
-    search_url = f"https://search.danawa.com/dsearch.php?query={encoded_keyword}&tab=main"
+    frozen = MappingProxyType(dict(result))
+    with _keyword_cache_lock:
+        _keyword_cache[keyword_key] = frozen
+        _keyword_cache.move_to_end(keyword_key)
+        while len(_keyword_cache) > KEYWORD_CACHE_SIZE:
+            _keyword_cache.popitem(last=False)
+    return frozen
 
-    user_agent = (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/120.0.0.0 Safari/537.36"
-    )
 
-    playwright_result: dict[str, str] | None = None
-    try:
-        with sync_playwright() as playwright:
-            browser = None
-            context = None
-            try:
-                browser = playwright.chromium.launch(headless=True)
-                context = browser.new_context(user_agent=user_agent)
-                page = context.new_page()
+class DanawaSearchError(RuntimeError):
+    """다나와 검색 자체가 실패한 경우 (타임아웃/연결 오류 등, 결과 없음과 구분하여 캐시하지 않음)."""
 
-                logging.info("[normalize] search_url=%s keyword=%s", search_url, search_keyword)
 
-                page.goto(search_url, timeout=20000, wait_until="domcontentloaded")
-                # 페이지 로딩 대기 시간 추가
-                page.wait_for_timeout(2000)
-                
-                # 검색 결과 확인
-                products_found = False
-                try:
-                    page.wait_for_selector(".product_list .prod_item", timeout=10000)
-                    products_found = True
-                except PlaywrightTimeoutError:
-                    # 검색 결과가 없거나 로딩이 느린 경우
-                    logging.warning("[normalize] product list selector timeout, trying alternative selectors")
-                    # 대체 선택자 시도
-                    try:
-                        page.wait_for_selector(".prod_item, .product_item", timeout=5000)
-                        products_found = True
-                    except PlaywrightTimeoutError:
-                        logging.warning("[normalize] no products found with any selector")
-                        products_found = False
+def _search_danawa_uncached(search_keyword: str) -> dict[str, str] | None:
+    """
+    캐시 없이 다나와 검색을 수행 (requests 우선, 실패 시 Playwright).
 
-                if not products_found:
-                    logging.warning("[normalize] skipping product extraction - no products found")
-                else:
-                    # 여러 선택자 시도
-                    product_locator = None
-                    for selector in [".product_list .prod_item", ".prod_item", ".product_item"]:
-                        locator = page.locator(selector).first
-                        if locator.count() > 0:
-                            product_locator = locator
-                            logging.info(f"[normalize] found products with selector: {selector}")
-                            break
-                    
-                    if not product_locator or product_locator.count() == 0:
-                        logging.warning("[normalize] no product items found with any selector")
-                    else:
-                        product_link_locator = product_locator.locator(
-                            ".prod_name a, a[class^='click_log_product_standard_title_']"
-                        ).first
-                        if product_link_locator.count() == 0:
-                            logging.warning("[normalize] product link not found")
-                        else:
-                            product_url = product_link_locator.get_attribute("href")
-                            if not product_url:
-                                logging.warning("[normalize] product link has no href")
-                            else:
-                                if product_url.startswith("/info"):
-                                    product_url = "http://prod.danawa.com" + product_url
-
-                            page.goto(product_url, timeout=20000, wait_until="domcontentloaded")
-                            # 상세 페이지 로딩 대기
-                            page.wait_for_timeout(2000)
-
-                            model_name = None
-                            spec_rows = page.locator("table.spec_tbl tr, .spec_tbl tr, .prod_spec tr")
-                            for index in range(spec_rows.count()):
-                                row = spec_rows.nth(index)
-                                th = row.locator("th").first
-                                td = row.locator("td").first
-
-                                if th.count() == 0 or td.count() == 0:
-                                    continue
-
-                                try:
-                                    label = th.inner_text(timeout=2000).strip().lower()
-                                    value = td.inner_text(timeout=2000).strip()
-                                except PlaywrightTimeoutError:
-                                    continue
-
-                                if any(keyword in label for keyword in ["모델명", "제품모델명", "model", "model name"]):
-                                    model_name = value
-                                    break
+    검색 페이지를 정상적으로 받아 파싱했지만 결과가 없으면 None을 반환하고,
+    Playwright 대체 경로가 오류로 끝났거나 requests가 오류로 끝난 뒤 Playwright도 결과를 찾지 못한 경우에는
+    DanawaSearchError를 발생시킵니다 (호출자는 이 경우 실패 결과를 캐시하지 않음).
+    """
+    encoded_keyword = quote(search_keyword)
+    search_url = f"https://search.danawa.com/dsearch.php?query={encoded_keyword}&tab=main"
 
-                            if not model_name:
-                                # 제목에서 모델명 추출 시도
-                                product_title_locator = page.locator("h3.prod_tit, h1.prod_tit, .prod_tit").first
-                                if product_title_locator.count() > 0:
-                                    try:
-                                        title_text = product_title_locator.inner_text(timeout=2000)
-                                        logging.info(f"[normalize] title text: {title_text[:100]}")
-                                    except PlaywrightTimeoutError:
-                                        title_text = ""
-                                    # 더 다양한 모델명 패턴 시도
-                                    patterns = [
-                                        r"\b[A-Z]{2,}[0-9A-Z]{4,}\b",  # 기본 패턴
-                                        r"\b[A-Z]{2,}[0-9]{2,}[A-Z]{0,}[0-9A-Z]{2,}\b",  # AP70F03102RTD 같은 패턴
-                                        r"\b[A-Z]{2,}[0-9]{1,}[A-Z]{1,}[0-9]{1,}[A-Z]{0,}[0-9A-Z]{1,}\b",  # 더 유연한 패턴
-                                    ]
-                                    for pattern in patterns:
-                                        matches = re.findall(pattern, title_text)
-                                        if matches:
-                                            model_name = matches[0]
-                                            logging.info(f"[normalize] found model in title with pattern {pattern}: {model_name}")
-                                            break
-
-                            if not model_name:
-                                # 상세 정보에서 모델명 추출 시도
-                                detail_info_locator = page.locator(".prod_summary_info, .product_info, .spec_summary").first
-                                if detail_info_locator.count() > 0:
-                                    try:
-                                        info_text = detail_info_locator.inner_text(timeout=2000)
-                                        logging.info(f"[normalize] info text: {info_text[:100]}")
-                                    except PlaywrightTimeoutError:
-                                        info_text = ""
-                                    patterns = [
-                                        r"\b[A-Z]{2,}[0-9A-Z]{4,}\b",
-                                        r"\b[A-Z]{2,}[0-9]{2,}[A-Z]{0,}[0-9A-Z]{2,}\b",
-                                        r"\b[A-Z]{2,}[0-9]{1,}[A-Z]{1,}[0-9]{1,}[A-Z]{0,}[0-9A-Z]{1,}\b",
-                                    ]
-                                    for pattern in patterns:
-                                        matches = re.findall(pattern, info_text)
-                                        if matches:
-                                            model_name = matches[0]
-                                            logging.info(f"[normalize] found model in info with pattern {pattern}: {model_name}")
-                                            break
-                                    
-                            # URL에서 pcode 추출 (모델명이 없어도 URL은 유효)
-                            current_url = page.url
-                            pcode_match = re.search(r'pcode=(\d+)', current_url)
-                            if pcode_match:
-                                logging.info(f"[normalize] found pcode in URL: {pcode_match.group(1)}")
-                            
-                            # 모델명이 없어도 URL이 있으면 반환 (나중에 모델명 추출 가능)
-                            # 하지만 우선 모델명을 찾기 위해 페이지 전체 텍스트에서도 시도
-                            if not model_name:
-                                try:
-                                    # 페이지 전체에서 모델명 패턴 검색
-                                    page_text = page.locator("body").inner_text(timeout=3000)
-                                    patterns = [
-                                        r"\bAP\d{2}[A-Z]\d{5}[A-Z]{2,}\b",  # AP70F03102RTD 같은 패턴
-                                        r"\b[A-Z]{2,}\d{2,}[A-Z]{1,}\d{2,}[A-Z]{2,}\b",  # 일반적인 긴 모델명
-                                        r"\b[A-Z]{2,}[0-9A-Z]{6,}\b",  # 6자 이상 모델명
-                                    ]
-                                    for pattern in patterns:
-                                        matches = re.findall(pattern, page_text)
-                                        if matches:
-                                            # 가장 긴 모델명을 선택 (일반적으로 더 정확함)
-                                            model_name = max(matches, key=len)
-                                            logging.info(f"[normalize] found model in page text with pattern {pattern}: {model_name}")
-                                            break
-                                except Exception as e:
-                                    logging.warning(f"[normalize] failed to extract model from page text: {e}")
-
-                            if model_name:
-                                logging.info("[normalize] extracted model=%s url=%s", model_name, product_url)
-                                playwright_result = {"model": model_name, "url": product_url}
-                            elif product_url:
-                                # 모델명을 찾지 못했지만 URL은 있으면, URL 기반으로 임시 모델명 생성
-                                # pcode를 모델명으로 사용하거나, URL의 일부를 사용
-                                if pcode_match:
-                                    temp_model = f"PCODE_{pcode_match.group(1)}"
-                                    logging.warning(f"[normalize] model name not found, using pcode as model: {temp_model}")
-                                    playwright_result = {"model": temp_model, "url": product_url}
-                                else:
-                                    logging.warning("[normalize] model name not found in detail page and no pcode")
-                            else:
-                                logging.warning("[normalize] model name not found in detail page")
-            finally:
-                if context is not None:
-                    try:
-                        context.close()
-                    except Exception as exc:
-                        logging.warning("[normalize] context close failed: %s", exc)
-                if browser is not None:
-                    try:
-                        browser.close()
-                    except Exception as exc:
-                        logging.warning("[normalize] browser close failed: %s", exc)
+    # 1. 브라우저 없이 requests로 먼저 시도 (대부분 여기서 끝남)
+    request_error: Exception | None = None
+    try:
+        result = _search_with_requests(search_url)
+    except Exception as exc:  # noqa: BLE001
+        logging.warning("[normalize-requests] request parsing failed: %s", exc)
+        request_error = exc
+        result = None
+
+    if result:
+        return result
+
+    # 2. 봇 차단이나 JS 렌더링 때문에 파싱하지 못한 경우에만 Playwright 사용
+    logging.info("[normalize] falling back to Playwright")
+    try:
+        result = _run_with_browser(_search_with_playwright, search_url, search_keyword, _USER_AGENT)
     except PlaywrightTimeoutError as exc:
+        # 대체 경로가 끝까지 실행되지 않았으므로 requests 결과와 관계없이 "결과 없음"으로 확정하지 않음
         logging.error("[normalize] Playwright timeout: %s", exc)
+        raise DanawaSearchError(f"다나와 검색 실패: {search_keyword}") from exc
     except Exception as exc:
         logging.error("[normalize] unexpected error: %s", exc, exc_info=True)
+        raise DanawaSearchError(f"다나와 검색 실패: {search_keyword}") from exc
 
-    if playwright_result:
-        return playwright_result
+    # requests가 오류로 끝났다면 Playwright의 빈 결과만으로는 "결과 없음"을 확정할 수 없음
+    if not result and request_error is not None:
+        raise DanawaSearchError(f"다나와 검색 실패: {search_keyword}") from request_error
+    return result
 
-    logging.info("[normalize] falling back to requests parser")
-    try:
-        return _search_with_requests(search_url, user_agent)
-    except Exception as exc:  # noqa: BLE001
-        logging.error("[normalize-fallback] request parsing failed: %s", exc, exc_info=True)
-        return None
 
+def save_product_mapping(product_name: str, mapping: Mapping[str, str]) -> None:
+    """제품명 -> 모델명/URL 매핑을 저장하고 대소문자 무시 인덱스를 함께 갱신."""
+    load_saved_mappings()
+    product_name_to_model[product_name] = mapping
+    _product_name_ci_index[canonical_product_key(product_name)] = product_name
+    _disk_writer.submit(_store_disk_mapping, product_name, mapping)
 
-def convert_product_name_to_model(product_name: str) -> dict[str, str] | None:
+
+def find_saved_product_name(product_name: str) -> str | None:
+    """
+    저장된 매핑에서 제품명을 찾아 원본 키를 반환 (대소문자 무시)
+    
+    Args:
+        product_name: 조회할 제품명
+    
+    Returns:
+        product_name_to_model에 저장된 원본 제품명 또는 None
+    """
+    load_saved_mappings()
+    if product_name in product_name_to_model:
+        return product_name
+    return _product_name_ci_index.get(canonical_product_key(product_name))
+
+
+def _get_cached_resolution(cache_key: str) -> Mapping[str, str] | None:
+    """LRU 캐시에서 검색 결과를 조회하고 최근 사용 항목으로 갱신."""
+    with _resolver_cache_lock:
+        cached = _resolver_cache.get(cache_key)
+        if cached is not None:
+            _resolver_cache.move_to_end(cache_key)
+        return cached
+
+
+def _put_cached_resolution(cache_key: str, result: Mapping[str, str]) -> None:
+    """검색 결과를 LRU 캐시에 저장하고 용량을 넘으면 가장 오래된 항목을 제거."""
+    with _resolver_cache_lock:
+        _resolver_cache[cache_key] = result
+        _resolver_cache.move_to_end(cache_key)
+        while len(_resolver_cache) > RESOLVER_CACHE_SIZE:
+            _resolver_cache.popitem(last=False)
+
+
+def _get_disk_cache() -> sqlite3.Connection | None:
+    """디스크 캐시 연결을 (최초 사용 시) 열어서 반환. 비활성화되었거나 열 수 없으면 None."""
+    global _disk_cache, NORMALIZE_CACHE_DB
+    if _disk_cache is None and NORMALIZE_CACHE_DB:
+        try:
+            _ensure_parent_dir(NORMALIZE_CACHE_DB)
+            conn = sqlite3.connect(NORMALIZE_CACHE_DB, check_same_thread=False)
+            # WAL + synchronous=NORMAL: 쓰기마다 fsync하지 않아 요청 경로의 쓰기 지연이 짧음
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS norm (k TEXT PRIMARY KEY, model TEXT, url TEXT, ts REAL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS mappings (name TEXT PRIMARY KEY, model TEXT, url TEXT, ts REAL)"
+            )
+            conn.commit()
+            _disk_cache = conn
+        except (OSError, sqlite3.Error) as exc:
+            logging.warning("[normalize] disk cache disabled (%s): %s", NORMALIZE_CACHE_DB, exc)
+            NORMALIZE_CACHE_DB = ""
+    return _disk_cache
+
+
+def _load_disk_resolution(cache_key: str) -> tuple[bool, Mapping[str, str] | None]:
+    """
+    디스크 캐시에서 검색 결과를 조회합니다.
+    
+    Returns:
+        (캐시 적중 여부, 결과) 튜플. 만료되지 않은 실패 기록이면 (True, None)
+    """
+    with _disk_cache_lock:
+        conn = _get_disk_cache()
+        if conn is None:
+            return False, None
+        try:
+            row = conn.execute("SELECT model, url, ts FROM norm WHERE k = ?", (cache_key,)).fetchone()
+        except sqlite3.Error as exc:
+            logging.warning("[normalize] disk cache read failed: %s", exc)
+            return False, None
+    if row is None:
+        return False, None
+    model, url, ts = row
+    if model is None:
+        # 실패 기록은 TTL 동안만 유효
+        return time.time() - ts < NEGATIVE_CACHE_TTL, None
+    if _is_expired(ts):
+        # 오래된 검색 결과는 다시 검색하여 모델명/URL 변경을 반영
+        return False, None
+    return True, MappingProxyType({"model": model, "url": url})
+
+
+def _store_disk_resolution(cache_key: str, result: Mapping[str, str] | None) -> None:
+    """검색 결과(실패 시 None)를 디스크 캐시에 기록."""
+    model = result["model"] if result else None
+    url = result["url"] if result else None
+    with _disk_cache_lock:
+        conn = _get_disk_cache()
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO norm (k, model, url, ts) VALUES (?, ?, ?, ?)",
+                (cache_key, model, url, time.time()),
+            )
+            conn.commit()
+        except sqlite3.Error as exc:
+            logging.warning("[normalize] disk cache write failed: %s", exc)
+
+
+def _store_disk_mapping(product_name: str, mapping: Mapping[str, str]) -> None:
+    """저장된 제품 매핑을 디스크 캐시에 기록 (_disk_writer 스레드에서 실행, 서버 재시작 후 /crawl에서 바로 사용)."""
+    with _disk_cache_lock:
+        conn = _get_disk_cache()
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO mappings (name, model, url, ts) VALUES (?, ?, ?, ?)",
+                (product_name, mapping["model"], mapping["url"], time.time()),
+            )
+            conn.commit()
+        except sqlite3.Error as exc:
+            logging.warning("[normalize] mapping write failed: %s", exc)
+
+
+def _is_expired(ts: float) -> bool:
+    """디스크에 저장된 검색 결과/매핑이 MAPPING_TTL보다 오래되었는지 확인."""
+    return MAPPING_TTL > 0 and time.time() - ts >= MAPPING_TTL
+
+
+def _read_saved_mappings() -> None:
+    """디스크 캐시에 저장된 제품 매핑(만료되지 않은 항목)으로 product_name_to_model과 대소문자 무시 인덱스를 복원."""
+    min_ts = time.time() - MAPPING_TTL if MAPPING_TTL > 0 else 0.0
+    with _disk_cache_lock:
+        conn = _get_disk_cache()
+        if conn is None:
+            return
+        try:
+            # 만료된 매핑은 복원하지 않고 파일에서도 제거
+            conn.execute("DELETE FROM mappings WHERE ts < ?", (min_ts,))
+            conn.commit()
+            rows = conn.execute("SELECT name, model, url FROM mappings ORDER BY ts").fetchall()
+        except sqlite3.Error as exc:
+            logging.warning("[normalize] mapping load failed: %s", exc)
+            return
+    for name, model, url in rows:
+        product_name_to_model[name] = MappingProxyType({"model": model, "url": url})
+        _product_name_ci_index[canonical_product_key(name)] = name
+    if rows:
+        logging.info("[normalize] restored %d saved product mappings", len(rows))
+
+
+def load_saved_mappings() -> None:
+    """
+    저장된 제품 매핑을 디스크에서 한 번만 복원 (이후 호출은 바로 반환)
+
+    SQLite 읽기는 블로킹 작업이므로 서버 시작 시 스레드에서 미리 호출합니다.
+    호출하지 않은 경우(모듈 직접 사용 등)에는 처음 조회/저장할 때 복원합니다.
+    """
+    global _mappings_loaded
+    if _mappings_loaded:
+        return
+    with _mappings_load_lock:
+        if not _mappings_loaded:
+            _read_saved_mappings()
+            _mappings_loaded = True
+
+
+def _remember_resolution(cache_key: str, result: Mapping[str, str]) -> Mapping[str, str]:
+    """검색 결과를 읽기 전용 매핑으로 만들어 메모리/디스크 캐시에 저장하고 반환."""
+    frozen = MappingProxyType(dict(result))
+    _put_cached_resolution(cache_key, frozen)
+    _store_disk_resolution(cache_key, frozen)
+    return frozen
+
+
+def convert_product_name_to_model(product_name: str) -> Mapping[str, str] | None:
     """
     제품 이름을 모델명과 URL로 변환하는 함수 (다나와에서 자동 검색)
     
     다나와에서 제품명으로 검색하여 첫 번째 결과의 모델명과 URL을 추출합니다.
     이미 저장된 매핑이 있으면 그것을 우선적으로 사용합니다.
     검색 결과가 없을 경우 키워드 변형을 시도합니다.
+    성공한 검색 결과는 LRU 캐시에 보관되며, 캐시된 값이 변경되지 않도록
+    읽기 전용 매핑으로 반환됩니다. 검색 결과는 SQLite 디스크 캐시에도 기록되어
+    서버 재시작 후에도 재사용되며, 실패한 제품명은 TTL 동안 다시 검색하지 않습니다.
     
     Args:
         product_name: 제품 이름 (예: "삼성 블루스카이 5500")
     
     Returns:
         {"model": "모델명", "url": "URL"} (예: {"model": "AX060CG500G", "url": "http://..."}) 또는 None
+    
+    Raises:
+        DanawaSearchError: 타임아웃/연결 오류 등으로 검색을 완료하지 못한 경우 (캐시하지 않음)
     """
-    # 먼저 저장된 매핑에서 확인 (캐시된 결과 우선 사용)
-    if product_name in product_name_to_model:
-        return product_name_to_model[product_name]
+    # 먼저 저장된 매핑에서 확인 (대소문자 무시, 캐시된 결과 우선 사용)
+    saved_name = find_saved_product_name(product_name)
+    if saved_name is not None:
+        return product_name_to_model[saved_name]
+    
+    cache_key = canonical_product_key(product_name)
+    cached = _get_cached_resolution(cache_key)
+    if cached is not None:
+        return cached
     
-    # 대소문자 무시로 저장된 매핑 확인
-    for key, value in product_name_to_model.items():
-        if key.lower() == product_name.lower():
-            return value
+    # 서버 재시작 전의 검색 결과(또는 최근 실패 기록)가 디스크에 있으면 재사용
+    hit, stored = _load_disk_resolution(cache_key)
+    if hit:
+        if stored is not None:
+            _put_cached_resolution(cache_key, stored)
+        return stored
     
-    # 검색 키워드 변형 생성
+    # 검색 키워드 변형 생성 (필요할 때만 생성되는 제너레이터)
     search_keywords = normalize_search_keyword(product_name)
     
-    # 각 키워드로 검색 시도
-    for keyword in search_keywords:
-        result = search_danawa_and_extract_model(keyword)
-        if result:
-            return result
+    # 원본 제품명은 현재 스레드에서 먼저 검색 (대부분 여기서 성공하므로 변형은 만들지도 않음)
+    search_error: DanawaSearchError | None = None
+    try:
+        result = search_danawa_and_extract_model(next(search_keywords))
+    except DanawaSearchError as exc:
+        search_error = exc
+        result = None
+    if result:
+        return _remember_resolution(cache_key, result)
+    
+    # 실패한 경우에만 나머지 변형을 동시에 검색하되, 결과는 우선순위 순서대로 확인
+    # (앞선 키워드가 성공하면 나머지는 취소, 실패하면 이미 진행 중인 다음 키워드 결과를 사용)
+    futures = [_keyword_executor.submit(search_danawa_and_extract_model, keyword) for keyword in search_keywords]
+    try:
+        for future in futures:
+            try:
+                result = future.result()
+            except DanawaSearchError as exc:
+                search_error = search_error or exc
+                continue
+            if result:
+                return _remember_resolution(cache_key, result)
+    finally:
+        for future in futures:
+            future.cancel()
+    
+    # 일시적인 오류로 끝난 검색이 있으면 실패 결과를 캐시하지 않고 호출자에게 알림
+    if search_error is not None:
+        raise search_error
     
-    # 모든 키워드로 검색해도 실패한 경우
+    # 모든 키워드로 검색해도 결과가 없는 경우 (TTL 동안 같은 제품명 재검색 방지)
+    _store_disk_resolution(cache_key, None)
     return None
 
+
+async def convert_product_name_to_model_async(product_name: str) -> Mapping[str, str] | None:
+    """
+    convert_product_name_to_model의 비동기 버전 (FastAPI 엔드포인트 등 이벤트 루프에서 사용)
+    
+    다나와 요청과 BeautifulSoup 파싱은 블로킹 작업이므로 스레드에서 실행하여
+    요청이 몰려도 이벤트 루프가 다른 요청을 계속 처리할 수 있도록 합니다.
+    """
+    return await asyncio.to_thread(convert_product_name_to_model, product_name)
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# 테스트에서 `app` 패키지를 import할 수 있도록 fastapi 디렉터리를 경로에 추가
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
@@ -0,0 +1,62 @@
+"""다나와 요청용 HTTP 캐시 세션 테스트"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+pytest.importorskip("requests_cache")
+
+from app import normalize_product_name  # noqa: E402
+
+
+class _CacheableHandler(BaseHTTPRequestHandler):
+    """캐시를 허용하는 헤더와 함께 응답하는 서버 (요청 횟수를 기록)"""
+
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        body = b"<html><body><div class='product_list'></div></body></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "public, max-age=3600")
+        self.send_header("ETag", '"search-page"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def search_server():
+    _CacheableHandler.hits = 0
+    server = HTTPServer(("127.0.0.1", 0), _CacheableHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_search_page_is_never_served_from_cache(search_server, tmp_path, monkeypatch):
+    """Cache-Control 헤더가 캐시를 허용해도 상세 페이지가 아닌 검색 결과 페이지는 매번 새로 요청"""
+    monkeypatch.setattr(normalize_product_name, "HTTP_CACHE_DB", str(tmp_path / "http_cache.sqlite3"))
+    session = normalize_product_name._create_session()
+    search_url = f"{search_server}/dsearch.php?query=test&tab=main"
+
+    try:
+        first = session.get(search_url, timeout=5)
+        second = session.get(search_url, timeout=5)
+        stored = session.cache.contains(url=search_url)
+    finally:
+        session.close()
+
+    assert first.status_code == second.status_code == 200
+    assert not getattr(second, "from_cache", False)
+    assert _CacheableHandler.hits == 2
+    assert not stored